@@ -0,0 +1,133 @@
+# batch_engine.py
+import random
+
+
+# Drive model shared by every game engine so score distributions line up
+DRIVES_PER_TEAM = 11      # Possessions each team gets in regulation
+BASE_TD_CHANCE = 0.22     # Touchdown chance on a drive between evenly rated teams
+BASE_FG_CHANCE = 0.15     # Field goal chance on a drive between evenly rated teams
+TD_EDGE_WEIGHT = 0.9      # How strongly the offense/defense gap moves the TD chance
+FG_EDGE_WEIGHT = 0.3      # How strongly the offense/defense gap moves the FG chance
+HOME_FIELD_EDGE = 2.0     # Rating points added to the home offense
+TOUCHDOWN_POINTS = 7
+FIELD_GOAL_POINTS = 3
+
+
+def drive_chances(offense, defense):
+    """Returns the (touchdown, field goal) chances for one drive of offense vs defense."""
+    edge = (offense - defense) / 100.0
+    td = min(max(BASE_TD_CHANCE + TD_EDGE_WEIGHT * edge, 0.02), 0.65)
+    fg = min(max(BASE_FG_CHANCE + FG_EDGE_WEIGHT * edge, 0.02), 0.35)
+    return td, fg
+
+
+class GameResult:
+    """Final score of a batch-simulated game. Mirrors the fields update_standings reads from Gameplay."""
+
+    __slots__ = ("home_team", "away_team", "score")
+
+    def __init__(self, home_team, away_team, home_score, away_score):
+        self.home_team = home_team
+        self.away_team = away_team
+        self.score = {home_team.name: home_score, away_team.name: away_score}
+
+
+class BatchGameEngine:
+    """
+    Simulates many games at once from team rating vectors instead of
+    building one Gameplay object per matchup. Ratings come from each Team's
+    cached TeamRatings, so roster changes are picked up without any reset.
+    """
+
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random
+
+    def simulate_scores(self, games, game_rngs=None):
+        """
+        Resolves every drive of every game in one pass.
+        Returns a list of (home_score, away_score) in the same order as games.
+        game_rngs optionally gives each game its own generator (e.g. RngStreams), so a
+        game's result doesn't depend on which other games share the batch.
+        """
+        count = len(games)
+        if not count:
+            return []
+
+        # Per-game drive chances for both offenses, laid out side by side
+        home_td, home_fg, away_td, away_fg = [], [], [], []
+        for home_team, away_team in games:
+            home_off, home_def = home_team.ratings.vector
+            away_off, away_def = away_team.ratings.vector
+            td, fg = drive_chances(home_off + HOME_FIELD_EDGE, away_def)
+            home_td.append(td)
+            home_fg.append(td + fg)
+            td, fg = drive_chances(away_off, home_def)
+            away_td.append(td)
+            away_fg.append(td + fg)
+
+        # One uniform draw per drive for the whole batch, consumed column by column
+        if game_rngs is None:
+            draws = self._draw(2 * DRIVES_PER_TEAM * count)
+            tiebreak_rngs = [self.rng] * count
+        else:
+            per_game = 2 * DRIVES_PER_TEAM
+            draws = _interleave([[rng.random() for _ in range(per_game)] for rng in game_rngs])
+            tiebreak_rngs = game_rngs
+        home_scores = [0] * count
+        away_scores = [0] * count
+        offset = 0
+        for _ in range(DRIVES_PER_TEAM):
+            _score_drives(draws, offset, home_td, home_fg, home_scores)
+            offset += count
+            _score_drives(draws, offset, away_td, away_fg, away_scores)
+            offset += count
+
+        # No ties: the better-placed side wins a sudden-death field goal
+        for i in range(count):
+            if home_scores[i] == away_scores[i]:
+                home_share = home_td[i] / (home_td[i] + away_td[i])
+                if tiebreak_rngs[i].random() < home_share:
+                    home_scores[i] += FIELD_GOAL_POINTS
+                else:
+                    away_scores[i] += FIELD_GOAL_POINTS
+
+        return list(zip(home_scores, away_scores))
+
+    def simulate_week(self, games, game_rngs=None):
+        """Simulates a list of (home_team, away_team) games and returns GameResult objects."""
+        scores = self.simulate_scores(games, game_rngs)
+        return [GameResult(home, away, home_score, away_score)
+                for (home, away), (home_score, away_score) in zip(games, scores)]
+
+    def _draw(self, n):
+        rand = self.rng.random
+        return [rand() for _ in range(n)]
+
+
+def _interleave(per_game):
+    """Turns per-game draw lists into the drive-major layout simulate_scores consumes."""
+    return [draw for column in zip(*per_game) for draw in column]
+
+
+def _score_drives(draws, offset, td_chances, fg_chances, scores):
+    """Adds one drive's points for every game in the batch."""
+    for i, td in enumerate(td_chances):
+        u = draws[offset + i]
+        if u < td:
+            scores[i] += TOUCHDOWN_POINTS
+        elif u < fg_chances[i]:
+            scores[i] += FIELD_GOAL_POINTS
+
+
+# Example Usage: (SeasonSimulator selects this engine with engine="batch")
+if __name__ == "__main__":
+    from players_and_draft import Draft
+
+    draft = Draft(num_draft_players=40, num_teams=4)
+    draft.run_draft()
+
+    engine = BatchGameEngine()
+    matchups = [(draft.teams[0], draft.teams[1]), (draft.teams[2], draft.teams[3])]
+    for result in engine.simulate_week(matchups):
+        print(f"{result.away_team.name} {result.score[result.away_team.name]} @ "
+              f"{result.home_team.name} {result.score[result.home_team.name]}")
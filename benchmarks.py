@@ -0,0 +1,286 @@
+# benchmarks.py
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from events import SILENT
+from players_and_draft import Draft
+from rng_streams import RngStream
+from simulation import SeasonSimulator
+
+RESULTS_DIR = "bench_results"
+REGRESSION_THRESHOLD = 1.25 # Slower than baseline by this factor counts as a regression
+DRAFT_ROUNDS = 7 # Rounds drafted before timing a save, so rosters are realistic
+
+# Startup check: launching the game and reaching the main menu must stay within the
+# budget, without importing the subsystems that game_state_manager loads on demand
+STARTUP_BUDGET_MS = 150
+LAZY_MODULES = ("players_and_draft", "simulation", "batch_engine", "standings", "save_format", "save_journal",
+                "offseason", "market", "data_loaders")
+
+# Sizes per preset: pool sizes, team counts and season counts to sweep
+PRESETS = {
+    "quick": {"pool": [100, 1000, 10000], "teams": [2, 8, 32], "seasons": [1, 10]},
+    "full": {"pool": [100, 1000, 10000, 100000, 1000000], "teams": [2, 8, 32, 128, 256],
+             "seasons": [1, 10, 100, 1000]},
+}
+
+
+# --- Setup helpers ---
+def _quiet_draft(pool_size, num_teams, seed=0):
+    return Draft(num_draft_players=pool_size, num_teams=num_teams, verbose=False, rng=RngStream(seed))
+
+
+def _drafted_teams(num_teams, seed=0):
+    draft = _quiet_draft(num_teams * 22, num_teams, seed)
+    draft.run_draft()
+    return draft.teams
+
+
+# --- Cases ---
+# Each case takes its parameters and returns (setup, run, items): setup builds fresh
+# inputs untimed, run(inputs) is the timed body, items is the work done for throughput.
+def case_generate_players(pool):
+    draft = _quiet_draft(0, 2)
+    return (lambda: None), (lambda _: draft._generate_players(pool)), pool
+
+
+def case_run_draft(pool, teams):
+    picks = pool // teams * teams # The whole pool, split evenly between the teams
+    return (lambda: _quiet_draft(pool, teams)), (lambda draft: draft.run_draft()), picks
+
+
+def case_generate_schedule(teams, seasons):
+    weeks = 17 * seasons
+    simulator = SeasonSimulator(_drafted_teams(teams), weeks=weeks, engine="batch", verbose=False)
+    return (lambda: None), (lambda _: simulator._generate_schedule()), weeks
+
+
+def case_run_season(teams, seasons):
+    league = _drafted_teams(teams)
+    simulator = SeasonSimulator(league, weeks=17, engine="batch", verbose=False, rng=RngStream(1))
+
+    def run(_):
+        for _ in range(seasons):
+            simulator.reset_standings()
+            simulator.run_season()
+
+    games = sum(len(week) for week in simulator.schedule) * seasons
+    return (lambda: None), run, games
+
+
+def case_save_load(pool, teams):
+    from game_state_manager import Game
+    save_dir = tempfile.mkdtemp(prefix="rf_bench_")
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(save_dir, seed=0)
+        game.start_new_game(num_draft_players=pool, num_teams=teams)
+        game.draft.reporter = SILENT
+        game.draft.run_draft(rounds=min(DRAFT_ROUNDS, pool // teams))
+        game.current_state = "SEASON"
+
+    def run(_):
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.save_game("bench.dat")
+            loaded = Game.load_game("bench.dat", save_dir)
+            loaded.draft # Force the deferred sections so the full load is timed
+
+    run.cleanup = lambda: shutil.rmtree(save_dir, ignore_errors=True)
+    return (lambda: None), run, pool
+
+
+CASES = {
+    "generate_players": (case_generate_players, ("pool",)),
+    "run_draft": (case_run_draft, ("pool", "teams")),
+    "generate_schedule": (case_generate_schedule, ("teams", "seasons")),
+    "run_season": (case_run_season, ("teams", "seasons")),
+    "save_load": (case_save_load, ("pool", "teams")),
+}
+
+
+# --- Runner ---
+def measure(case, params, repeats):
+    """Times a case (best of repeats) and measures its peak traced memory in a separate run."""
+    setup, run, items = case(**params)
+    best = math.inf
+    for _ in range(repeats):
+        inputs = setup()
+        start = time.perf_counter()
+        run(inputs)
+        best = min(best, time.perf_counter() - start)
+
+    inputs = setup()
+    tracemalloc.start()
+    run(inputs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    getattr(run, "cleanup", lambda: None)()
+
+    return {"seconds": best, "items": items, "throughput": items / best if best else math.inf, "peak_bytes": peak}
+
+
+def scaling_exponents(results, case_name, axis):
+    """Log-log slope between consecutive sizes along one axis: 1.0 is linear, 2.0 quadratic."""
+    points = sorted((r["params"][axis], r["seconds"]) for r in results
+                    if r["case"] == case_name and axis in r["params"] and r["sweep"] == axis)
+    slopes = []
+    for (x0, t0), (x1, t1) in zip(points, points[1:]):
+        if x1 > x0 and t0 > 0 and t1 > 0:
+            slopes.append((x1, math.log(t1 / t0) / math.log(x1 / x0)))
+    return slopes
+
+
+def run_benchmarks(preset="quick", case_names=None, repeats=3):
+    sizes = PRESETS[preset]
+    results = []
+    for name in case_names or CASES:
+        case, axes = CASES[name]
+        for axis in axes:
+            # Sweep one axis and hold the others at their middle size
+            for value in sizes[axis]:
+                params = {a: value if a == axis else sizes[a][len(sizes[a]) // 2] for a in axes}
+                if name in ("run_draft", "save_load") and params["pool"] < params["teams"]:
+                    continue # Not enough prospects to give every team a pick
+                metrics = measure(case, params, repeats)
+                results.append({"case": name, "params": params, "sweep": axis, **metrics})
+                print(f"  {name:<18} {_format_params(params):<32} {metrics['seconds'] * 1000:10.2f} ms "
+                      f"{metrics['throughput']:14,.0f}/s {metrics['peak_bytes'] / 1e6:9.2f} MB")
+    return results
+
+
+def measure_startup(repeats=5):
+    """
+    Launches game_state_manager.py under -X importtime, picks Exit at the main menu and
+    keeps the fastest run: its wall time, total import time and the slowest top-level
+    imports, plus any on-demand module that was imported anyway.
+    """
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_state_manager.py")
+    best = None
+    for _ in range(repeats):
+        with tempfile.TemporaryDirectory() as directory: # The game creates its save folder here
+            start = time.perf_counter()
+            process = subprocess.run([sys.executable, "-X", "importtime", script], input="3\n",
+                                     capture_output=True, text=True, cwd=directory)
+            wall = time.perf_counter() - start
+        if process.returncode != 0:
+            raise RuntimeError(f"Game exited with {process.returncode}: {process.stderr[-500:]}")
+        if best is None or wall < best[0]:
+            best = (wall, process.stderr)
+
+    wall, log = best
+    imports = []
+    for line in log.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imports.append((name.rstrip(), int(cumulative)))
+    top_level = [(name.strip(), micros) for name, micros in imports if not name.startswith("  ")]
+    loaded = {name.strip() for name, _ in imports}
+    return {
+        "wall_ms": wall * 1000,
+        "import_ms": sum(micros for _, micros in top_level) / 1000,
+        "slowest": sorted(top_level, key=lambda entry: entry[1], reverse=True)[:8],
+        "eager": [module for module in LAZY_MODULES if module in loaded],
+    }
+
+
+def check_startup(budget_ms=STARTUP_BUDGET_MS, repeats=5):
+    """Prints the startup report and returns the number of problems (over budget, eager imports)."""
+    startup = measure_startup(repeats)
+    print(f"--- Startup (best of {repeats}) ---")
+    print(f"  Time to main menu: {startup['wall_ms']:.1f} ms (budget {budget_ms} ms)")
+    print(f"  Import time:       {startup['import_ms']:.1f} ms")
+    for name, micros in startup["slowest"]:
+        print(f"    {name:<28} {micros / 1000:8.2f} ms")
+    problems = 0
+    if startup["wall_ms"] > budget_ms:
+        print("  <-- OVER BUDGET")
+        problems += 1
+    if startup["eager"]:
+        print(f"  <-- Loaded before they were needed: {', '.join(startup['eager'])}")
+        problems += 1
+    return problems
+
+
+def _format_params(params):
+    return " ".join(f"{key}={value}" for key, value in params.items())
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save_results(results, preset, output=None):
+    commit = _git_commit()
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{commit}-{preset}.json")
+    report = {"commit": commit, "preset": preset, "python": platform.python_version(),
+              "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=4)
+    print(f"\nResults written to {output}")
+    return output
+
+
+def compare(results, baseline_path, threshold=REGRESSION_THRESHOLD):
+    """Prints the speed ratio against a saved run and returns the number of regressions."""
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f)
+    before = {(r["case"], _format_params(r["params"])): r for r in baseline["results"]}
+    print(f"\n--- Compared with {baseline['commit']} ({baseline_path}) ---")
+    regressions = 0
+    for result in results:
+        old = before.get((result["case"], _format_params(result["params"])))
+        if old is None:
+            continue
+        ratio = result["seconds"] / old["seconds"] if old["seconds"] else math.inf
+        flag = ""
+        if ratio > threshold:
+            flag = "  <-- REGRESSION"
+            regressions += 1
+        print(f"  {result['case']:<18} {_format_params(result['params']):<32} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Retro Football performance benchmarks")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--case", action="append", choices=sorted(CASES), help="Run only these cases")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="JSON results path (default bench_results/<commit>-<preset>.json)")
+    parser.add_argument("--compare", help="Earlier JSON results to compare against")
+    parser.add_argument("--startup", action="store_true", help="Only check time to the main menu")
+    parser.add_argument("--startup-budget", type=float, default=STARTUP_BUDGET_MS, help="Milliseconds")
+    args = parser.parse_args()
+
+    if args.startup:
+        raise SystemExit(1 if check_startup(args.startup_budget) else 0)
+
+    print(f"Running '{args.preset}' benchmarks (best of {args.repeats})")
+    results = run_benchmarks(args.preset, args.case, args.repeats)
+
+    print("\n--- Scaling (log-log slope vs previous size; 1.0 = linear) ---")
+    for name, (_, axes) in CASES.items():
+        for axis in axes:
+            slopes = scaling_exponents(results, name, axis)
+            if slopes:
+                print(f"  {name:<18} by {axis:<8} " + ", ".join(f"{size}: {slope:.2f}" for size, slope in slopes))
+
+    save_results(results, args.preset, args.output)
+    if args.compare and compare(results, args.compare):
+        raise SystemExit(1)
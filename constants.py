@@ -21,6 +21,8 @@ ATTRIBUTE_MAX = 99
 # Position Definitions
 OFFENSIVE_POSITIONS = ["QB", "RB", "WR", "WR", "TE", "C", "G", "G", "T", "T"]
 DEFENSIVE_POSITIONS = ["DE", "DE", "DT", "DT", "LB", "LB", "CB", "CB", "S", "S"]
+POSITION_CODES = ["QB", "RB", "WR", "TE", "C", "G", "T", "DE", "DT", "LB", "CB", "S"] # Index = compact position code
+OFFENSIVE_LINE_POSITIONS = ["C", "G", "T"]
 
 # Season Constants
 DEFAULT_SEASON_WEEKS = 3 # For demonstration, a short season
@@ -1,19 +1,32 @@
 # data_loaders.py
 import json
+import marshal
 import os
+import sys
+from collections import OrderedDict
+
+from events import CONSOLE
+
+try:
+    import ijson # Optional: streams very large JSON files item by item
+except ImportError:
+    ijson = None
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+LEAGUE_FILE = "league.json"
 
 def load_json_data(filepath):
     """
     Loads and returns data from a specified JSON file.
     Handles potential FileNotFoundError and JSON decoding errors.
     """
-    if not os.path.exists(filepath):
-        print(f"Error: Data file not found at {filepath}")
-        return None
     try:
         with open(filepath, 'r') as f:
             data = json.load(f)
         return data
+    except FileNotFoundError:
+        print(f"Error: Data file not found at {filepath}")
+        return None
     except json.JSONDecodeError:
         print(f"Error: Could not decode JSON from {filepath}. Check file format.")
         return None
@@ -21,17 +34,164 @@ def load_json_data(filepath):
         print(f"An unexpected error occurred while loading {filepath}: {e}")
         return None
 
-def save_json_data(data, filepath):
+def save_json_data(data, filepath, atomic=False, reporter=CONSOLE):
     """
     Saves data to a specified JSON file.
+    With atomic=True the data is written to a temporary file and renamed over the
+    target, so readers never see a half-written file.
     """
+    target = filepath + ".tmp" if atomic else filepath
     try:
-        with open(filepath, 'w') as f:
+        with open(target, 'w') as f:
             json.dump(data, f, indent=4)
-        print(f"Data saved to {filepath}")
+            if atomic:
+                f.flush()
+                os.fsync(f.fileno())
+        if atomic:
+            os.replace(target, filepath)
+        if reporter.enabled:
+            reporter.emit("data_saved", path=filepath)
     except Exception as e:
         print(f"Error saving data to {filepath}: {e}")
 
+
+class DataRegistry:
+    """
+    Loads data assets once and serves them from an LRU cache.
+    Entries are keyed on the file's modification time and size, so an edited file is
+    re-read on its next use. Parsed data can also be kept in a binary cache file next
+    to the JSON, which is much faster to read than re-parsing on startup.
+    """
+
+    def __init__(self, data_dir=DATA_DIR, max_entries=32, max_bytes=64 * 1024 * 1024, binary_cache=True):
+        self.data_dir = data_dir
+        self.max_entries = max_entries # Bound on cached files
+        self.max_bytes = max_bytes     # Bound on the summed size of cached files
+        self.binary_cache = binary_cache
+        self._cache = OrderedDict()    # path -> (stamp, size, data), least recently used first
+        self._cached_bytes = 0
+
+    def path(self, name):
+        return os.path.join(self.data_dir, name)
+
+    def get(self, name):
+        """Returns the parsed contents of a data file, or None if it can't be loaded."""
+        filepath = self.path(name)
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return load_json_data(filepath) # Reports the missing file the usual way
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        entry = self._cache.get(filepath)
+        if entry is not None and entry[0] == stamp:
+            self._cache.move_to_end(filepath)
+            return entry[2]
+
+        data = self._read_binary_cache(filepath, stamp)
+        if data is None:
+            data = load_json_data(filepath)
+            if data is None:
+                return None
+            self._write_binary_cache(filepath, stamp, data)
+        self._store(filepath, stamp, stat.st_size, data)
+        return data
+
+    def iter_items(self, name, prefix="item"):
+        """
+        Yields the elements at prefix (ijson syntax, e.g. "teams.item") one by one.
+        Uses ijson to stream large files when it is installed, else loads the file normally.
+        """
+        if ijson is not None:
+            with open(self.path(name), 'rb') as f:
+                yield from ijson.items(f, prefix)
+            return
+        data = self.get(name)
+        for key in prefix.split(".")[:-1]: # Trailing "item" means "each element"
+            data = data[key] if data is not None else None
+        yield from data or ()
+
+    def clear(self):
+        self._cache.clear()
+        self._cached_bytes = 0
+
+    def _store(self, filepath, stamp, size, data):
+        old = self._cache.pop(filepath, None)
+        if old is not None:
+            self._cached_bytes -= old[1]
+        self._cache[filepath] = (stamp, size, data)
+        self._cached_bytes += size
+        while self._cache and (len(self._cache) > self.max_entries or self._cached_bytes > self.max_bytes):
+            _, (_, evicted_size, _) = self._cache.popitem(last=False)
+            self._cached_bytes -= evicted_size
+
+    def _cache_path(self, filepath):
+        directory, filename = os.path.split(filepath)
+        return os.path.join(directory, f".{filename}.cache")
+
+    def _read_binary_cache(self, filepath, stamp):
+        if not self.binary_cache:
+            return None
+        try:
+            with open(self._cache_path(filepath), 'rb') as f:
+                cached_stamp, data = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        # marshal's format can change between Python versions, so that is part of the stamp
+        return data if cached_stamp == (*stamp, sys.version_info[:2]) else None
+
+    def _write_binary_cache(self, filepath, stamp, data):
+        if not self.binary_cache:
+            return
+        cache_path = self._cache_path(filepath)
+        try:
+            with open(cache_path + ".tmp", 'wb') as f:
+                marshal.dump(((*stamp, sys.version_info[:2]), data), f)
+            os.replace(cache_path + ".tmp", cache_path)
+        except (OSError, ValueError):
+            pass # The cache is only an optimization
+
+    # --- League data ---
+    def league_teams(self, count):
+        """
+        Returns count (name, abbreviation) pairs from the league file. Leagues bigger than
+        the file reuse its names with a number added so every team stays unique.
+        """
+        league = self.get(LEAGUE_FILE) or {}
+        base = [(team["name"], team["abbreviation"]) for team in league.get("teams", [])]
+        if not base:
+            base = [("Team", "TM")]
+        teams = []
+        for i in range(count):
+            name, abbr = base[i % len(base)]
+            cycle = i // len(base)
+            teams.append((name, abbr) if cycle == 0 else (f"{name} {cycle + 1}", f"{abbr}{cycle + 1}"))
+        return teams
+
+    def alignment(self, count):
+        """Returns each of count teams' (conference, division), following league_teams' order."""
+        league = self.get(LEAGUE_FILE) or {}
+        base = [(team.get("conference"), team.get("division")) for team in league.get("teams", [])]
+        if not base:
+            return [(None, None)] * count
+        return [base[i % len(base)] for i in range(count)]
+
+    def positions(self):
+        """Returns (offensive, defensive) lineup templates from the league file."""
+        positions = (self.get(LEAGUE_FILE) or {}).get("positions", {})
+        return positions.get("offense", []), positions.get("defense", [])
+
+    def prospect_profiles(self):
+        """
+        Returns the draft prospect attribute profiles from the league file:
+        {position or "default": {attribute: [mean, spread]}}. Empty if the file has none.
+        """
+        return (self.get(LEAGUE_FILE) or {}).get("prospects", {})
+
+
+# Shared registry used by the rest of the game
+registry = DataRegistry()
+
 # Example Usage: (Not typically run directly, but used by other modules)
 if __name__ == "__main__":
     # Create a dummy data file for demonstration
@@ -40,13 +200,17 @@ if __name__ == "__main__":
         "positions": ["QB", "RB", "WR", "DE", "LB"]
     }
     filepath = "dummy_data.json"
-    save_json_data(dummy_data, filepath)
-    
+    save_json_data(dummy_data, filepath, atomic=True)
+
     # Load the data back
     loaded_data = load_json_data(filepath)
     if loaded_data:
         print("\nSuccessfully loaded data:")
         print(loaded_data)
-        
+
     # Clean up the dummy file
     os.remove(filepath)
+
+    print("\nLeague teams from the registry:")
+    for name, abbr in registry.league_teams(10):
+        print(f"  {name} ({abbr})")
@@ -0,0 +1,147 @@
+# draft_ai.py
+from collections import Counter
+
+from constants import OFFENSIVE_POSITIONS, DEFENSIVE_POSITIONS, POSITION_CODES
+
+# Starters wanted at each position, taken from the lineup templates
+ROSTER_TEMPLATE = Counter(OFFENSIVE_POSITIONS + DEFENSIVE_POSITIONS)
+
+
+class TeamNeeds:
+    """Open starter slots per position for one team, kept current pick by pick."""
+
+    def __init__(self, team):
+        have = Counter(player.position for player in team.roster)
+        self.open_slots = {position: ROSTER_TEMPLATE[position] - have[position] for position in POSITION_CODES}
+
+    def record(self, position):
+        self.open_slots[position] -= 1
+
+    def total_open(self):
+        return sum(max(slots, 0) for slots in self.open_slots.values())
+
+
+class DraftStrategy:
+    """
+    Base class for draft AIs used by Draft.run_draft.
+    start_draft is called once, choose_pick once per pick, and record_pick after every
+    successful pick so strategies can update their state instead of rescanning rosters.
+    """
+
+    def start_draft(self, draft):
+        pass
+
+    def choose_pick(self, draft, team):
+        """Returns the pool row the team wants to draft."""
+        raise NotImplementedError
+
+    def record_pick(self, team, position):
+        pass
+
+
+class BestAvailableStrategy(DraftStrategy):
+    """Always takes the highest overall player left, like the default draft loop."""
+
+    def choose_pick(self, draft, team):
+        return draft.board.best_available()
+
+
+class NeedBasedStrategy(DraftStrategy):
+    """
+    Weighs each position's best remaining prospect against how many starters the team
+    still needs there, plus the prospect's upside and age. Only the top candidate per
+    position is scored, so a pick costs O(positions * log n) however big the pool is.
+    """
+
+    def __init__(self, need_weight=6.0, surplus_penalty=10.0, potential_weight=0.2, age_weight=1.0):
+        self.need_weight = need_weight           # Bonus per open starter slot at the position
+        self.surplus_penalty = surplus_penalty   # Cost of drafting where the starters are already set
+        self.potential_weight = potential_weight # Value of potential above current overall
+        self.age_weight = age_weight             # Cost per year older than the youngest prospects
+        self.needs = {} # Team -> TeamNeeds; holding the team keeps the key valid for the whole draft
+
+    def start_draft(self, draft):
+        self.needs = {team: TeamNeeds(team) for team in draft.teams}
+
+    def team_needs(self, team):
+        """The team's needs, built from its roster on first use for teams that joined after start_draft."""
+        needs = self.needs.get(team)
+        if needs is None:
+            needs = self.needs[team] = TeamNeeds(team)
+        return needs
+
+    def score(self, pool, row, open_slots):
+        """Draft value of one prospect for a team with open_slots starters missing at its position."""
+        overall = pool.overall[row]
+        value = overall + self.potential_weight * (pool.potential[row] - overall)
+        value -= self.age_weight * (pool.age[row] - 21)
+        if open_slots > 0:
+            return value + self.need_weight * open_slots
+        return value - self.surplus_penalty
+
+    def choose_pick(self, draft, team):
+        open_slots = self.team_needs(team).open_slots
+        pool, board = draft.pool, draft.board
+        best_row, best_value = None, None
+        for position in POSITION_CODES:
+            row = board.best_available(position)
+            if row is None:
+                continue
+            value = self.score(pool, row, open_slots[position])
+            if best_value is None or value > best_value:
+                best_row, best_value = row, value
+        return best_row
+
+    def record_pick(self, team, position):
+        self.team_needs(team).record(position)
+
+
+def _legacy_player_list(pool):
+    """The pre-DraftBoard pool: every prospect as a Player object, sorted best first."""
+    return sorted((pool.make_player(row) for row in range(len(pool))),
+                  key=lambda p: p.get_overall_rating(), reverse=True)
+
+
+def _legacy_greedy_draft(players, teams, rounds):
+    """The pre-DraftBoard loop: pop(0) from the sorted list every pick."""
+    for _ in range(rounds):
+        for team in teams:
+            if not players:
+                return
+            team.add_player(players.pop(0))
+
+
+# Benchmark: need-based AI against the greedy loop on a large pool
+if __name__ == "__main__":
+    import time
+    from players_and_draft import Draft, DraftBoard, Team
+
+    POOL_SIZE, NUM_TEAMS, ROUNDS = 50000, 64, 7
+    print(f"Draft benchmark: {POOL_SIZE} prospects, {NUM_TEAMS} teams, {ROUNDS} rounds")
+
+    template = Draft(num_draft_players=POOL_SIZE, num_teams=NUM_TEAMS, verbose=False)
+
+    # Every run builds its pool and board before the clock starts, so only the picks are timed
+    players = _legacy_player_list(template.pool)
+    teams = [Team(t.name, t.abbreviation) for t in template.teams]
+    start = time.perf_counter()
+    _legacy_greedy_draft(players, teams, ROUNDS)
+    print(f"  Greedy list.pop loop:     {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    need_fill = {}
+    for label, strategy in (("Greedy DraftBoard", None),
+                            ("BestAvailableStrategy", BestAvailableStrategy()),
+                            ("NeedBasedStrategy", NeedBasedStrategy())):
+        draft = Draft(num_draft_players=0, num_teams=NUM_TEAMS, verbose=False)
+        draft.pool = template.pool
+        draft.board = DraftBoard(template.pool)
+        start = time.perf_counter()
+        draft.run_draft(strategy=strategy, rounds=ROUNDS)
+        print(f"  {label + ':':<25} {(time.perf_counter() - start) * 1000:8.1f} ms")
+        starter_slots = sum(ROSTER_TEMPLATE.values())
+        slots_filled = sum(starter_slots - TeamNeeds(team).total_open() for team in draft.teams)
+        need_fill[label] = slots_filled / max(len(draft.drafted_players), 1) * 100
+
+    print("\nPicks that filled an open starter slot:")
+    for label, percent in need_fill.items():
+        print(f"  {label + ':':<25} {percent:5.1f}%")
@@ -0,0 +1,66 @@
+# draft_class.py
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from players_and_draft import PlayerPool, prospect_profiles
+from rng_streams import RngStream
+
+DEFAULT_CHUNK_SIZE = 50000 # Prospects per task; classes up to this size are generated in-process
+
+
+def _generate_chunk(rng, count, positions, first_id, profiles):
+    return PlayerPool.generate(count, positions, rng=rng, first_id=first_id, profiles=profiles)
+
+
+def _chunk_plan(count, chunk_size, master, first_id):
+    """Splits the class into (rng, count, first_id) tasks. Each chunk has its own RNG stream."""
+    return [(master.child("draft_class", start // chunk_size), min(chunk_size, count - start), first_id + start)
+            for start in range(0, count, chunk_size)]
+
+
+def generate_draft_class(count, positions, rng=None, first_id=0, workers=1, chunk_size=DEFAULT_CHUNK_SIZE,
+                         profiles=None):
+    """
+    Generates a draft class of count prospects as one PlayerPool.
+    A class that fits in one chunk is drawn straight from rng. Bigger classes are split into
+    chunks of chunk_size, each drawn from its own RngStream child and joined back in chunk
+    order, so the same rng gives the same class whether the chunks run here (workers=1, the
+    default) or across worker processes (workers=None uses every core). Callers that start
+    processes need the usual `if __name__ == "__main__":` guard on spawn platforms.
+    """
+    rng = rng if rng is not None else random
+    profiles = profiles if profiles is not None else prospect_profiles() # Read once, shipped to the workers
+    if count <= chunk_size:
+        return PlayerPool.generate(count, positions, rng=rng, first_id=first_id, profiles=profiles)
+
+    master = rng if hasattr(rng, "child") else RngStream(rng.getrandbits(64))
+    plan = _chunk_plan(count, chunk_size, master, first_id)
+    workers = min(workers or os.cpu_count() or 1, len(plan))
+    if workers == 1:
+        chunks = [_generate_chunk(chunk_rng, size, positions, start, profiles) for chunk_rng, size, start in plan]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_generate_chunk, *zip(*plan), [positions] * len(plan), [profiles] * len(plan)))
+    return PlayerPool.concat(chunks, first_id)
+
+
+# Example Usage: a million-prospect class, generated serially and across processes
+if __name__ == "__main__":
+    import time
+
+    from players_and_draft import Draft
+
+    COUNT = 1_000_000
+    results = {}
+    for workers in (1, None):
+        start = time.perf_counter()
+        pool = generate_draft_class(COUNT, Draft.ALL_POSITIONS, rng=RngStream(seed=7), workers=workers)
+        results[workers] = pool
+        print(f"workers={workers}: {COUNT} prospects in {time.perf_counter() - start:.2f}s")
+
+    serial, parallel = results[1], results[None]
+    print("Identical:", all(getattr(serial, column) == getattr(parallel, column)
+                            for column in ("name_index", "position_code", "speed", "strength", "skill", "age", "potential")))
+    top = serial.ranked()[:5]
+    print("Top prospects:", ", ".join(f"{serial.name(row)} ({serial.position(row)}, {serial.overall[row]})" for row in top))
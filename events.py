@@ -0,0 +1,170 @@
+# events.py
+import json
+import sys
+
+# Kinds that close a batch for sinks that write in batches
+BATCH_BOUNDARIES = frozenset(["week_end", "draft_end", "season_end"])
+
+
+def _format_standings(record):
+    lines = ["\n--- Final Season Standings ---"]
+    for row in record["standings"]:
+        lines.append(f"{row['team']:<10}: {row['wins']} W - {row['losses']} L")
+    lines.append("\n--- End of Season ---")
+    return "\n".join(lines)
+
+
+# How ConsoleSink and BufferedTextSink render each event kind. Kinds not listed are not shown.
+TEXT_FORMATS = {
+    "draft_start": "\n--- Starting Draft ---",
+    "draft_pick": "--- {player} ({position}) drafted by {team} ({abbreviation})! ---",
+    "draft_exhausted": "\nDraft concluded - no more players available.",
+    "season_start": "\n--- Starting Season {weeks} Weeks ---",
+    "week_start": "\n-- Simulating Week {week} --",
+    "game_result": "Simulated game: {away} {away_score} @ {home} {home_score}",
+    "season_end": _format_standings,
+    "offseason_end": "\n--- Offseason before Season {season}: {retired} players retired, "
+                     "{prospects} prospects in the draft class ---",
+    "market_end": "\n--- Market: {trades} trades, {signings} free agents signed ---",
+    "data_saved": "Data saved to {path}",
+    "game_saved": "Game saved successfully to {path}",
+}
+
+
+def format_text(record):
+    """Renders a record the way the game used to print it, or None if it has no text form."""
+    text = TEXT_FORMATS.get(record["event"])
+    if text is None:
+        return None
+    return text(record) if callable(text) else text.format(**record)
+
+
+# --- Sinks ---
+class NullSink:
+    """Discards every record."""
+
+    def write(self, record):
+        pass
+
+    def flush(self):
+        pass
+
+
+class ConsoleSink:
+    """Prints records as the game's usual console text."""
+
+    def __init__(self, stream=None):
+        self.stream = stream # None means whatever sys.stdout is at print time
+
+    def write(self, record):
+        text = format_text(record)
+        if text is not None:
+            print(text, file=self.stream or sys.stdout)
+
+    def flush(self):
+        (self.stream or sys.stdout).flush()
+
+
+class BufferedTextSink:
+    """Collects the console text in memory and writes it out in one go on flush."""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.lines = []
+
+    def write(self, record):
+        text = format_text(record)
+        if text is not None:
+            self.lines.append(text)
+
+    def flush(self):
+        if self.stream is not None and self.lines:
+            self.stream.write("\n".join(self.lines) + "\n")
+            self.lines.clear()
+
+
+class JsonlSink:
+    """Writes one JSON object per record, batching writes until the end of each week."""
+
+    def __init__(self, filepath):
+        self.file = open(filepath, 'a')
+        self._batch = []
+
+    def write(self, record):
+        self._batch.append(json.dumps(record, separators=(",", ":")))
+        if record["event"] in BATCH_BOUNDARIES:
+            self.flush()
+
+    def flush(self):
+        if self._batch:
+            self.file.write("\n".join(self._batch) + "\n")
+            self._batch.clear()
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+class ColumnarSink:
+    """
+    Gathers records into columns per event kind ({kind: {field: [values]}}) and hands
+    each finished batch to on_batch at the end of every week, draft or season.
+    """
+
+    def __init__(self, on_batch=None):
+        self.on_batch = on_batch
+        self.batches = [] # Kept when there is no on_batch callback
+        self._columns = {}
+
+    def write(self, record):
+        columns = self._columns.setdefault(record["event"], {})
+        for field, value in record.items():
+            if field != "event":
+                columns.setdefault(field, []).append(value)
+        if record["event"] in BATCH_BOUNDARIES:
+            self.flush()
+
+    def flush(self):
+        if not self._columns:
+            return
+        batch, self._columns = self._columns, {}
+        if self.on_batch is not None:
+            self.on_batch(batch)
+        else:
+            self.batches.append(batch)
+
+
+# --- Reporter ---
+class Reporter:
+    """
+    Sends structured event records to any number of sinks.
+    Producers check `enabled` before building a record, so a reporter
+    without sinks costs a single attribute test per event.
+    """
+
+    def __init__(self, *sinks):
+        self.sinks = list(sinks)
+        self.enabled = bool(self.sinks)
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        self.enabled = True
+
+    def emit(self, event, **fields):
+        fields["event"] = event
+        for sink in self.sinks:
+            sink.write(fields)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+
+# Shared reporters: the default console output, and silence for bulk runs
+CONSOLE = Reporter(ConsoleSink())
+SILENT = Reporter()
+
+
+def default_reporter(verbose=True):
+    return CONSOLE if verbose else SILENT
@@ -1,118 +1,281 @@
-import pickle # For saving/loading game state
 import os     # For file path operations
 
-from players_and_draft import Draft, Team # Import our previously defined classes
+from events import CONSOLE
+from instrumentation import PROFILER, timed
+from rng_streams import RngStream
+
+# Everything else (players and the draft, simulation, saves, the offseason) is imported
+# inside the methods of the state that first needs it, so the main menu comes up without
+# loading the subsystems. `python benchmarks.py --startup` keeps an eye on that.
+
+
+class GameCommandError(Exception):
+    """Raised by the headless commands when a command doesn't fit the game's current state."""
+
 
 class Game:
     """
     Manages the overall game state, including menus, draft, seasons, and saving/loading.
     """
 
-    def __init__(self, save_dir="saves"):
+    AUTOSAVE_FILENAME = "autosave.dat"
+    SEASON_WEEKS = 17
+
+    def __init__(self, save_dir="saves", autosave=False, seed=None, reporter=CONSOLE, verbose=True):
         self.current_state = "MAIN_MENU" # Possible states: "MAIN_MENU", "NEW_GAME", "LOAD_GAME", "DRAFT", "SEASON", "GAMEPLAY", "END_GAME"
         self.save_directory = save_dir
         os.makedirs(self.save_directory, exist_ok=True) # Ensure save directory exists
 
-        self.user_team = None
+        self.user_team = None # Chosen when a league is created or loaded
         self.all_teams = [] # List of all teams in the league
         self.draft = None
         self.current_season = 0
         self.schedule = [] # List of upcoming games
         self.current_week = 0
+        self.standings = None # StandingsTable for the current season
+        self.season_simulator = None # Plays the schedule one week at a time; rebuilt after loading
+        self.stats = None # SeasonStats fed by every week played; not saved, so a loaded game counts from there
+        self.offseason = None # OffseasonEngine, created for the first offseason; keeps stage timings
+        self.autosave = autosave # Journal every draft and week to the autosave file
+        self.journal = None
+        self.rng = RngStream(seed) # Master stream; the same seed replays the same league
+        self.reporter = reporter # Structured output for draft picks, games and saves
+        self.verbose = verbose # Print phase banners and rosters; headless games turn this off
 
-        self._initialize_game_data()
-
-    def _initialize_game_data(self):
-        """Initializes default game data, or loads if available."""
-        # For now, let's create a default set of teams for a new game scenario
-        # In a real game, you might load these from a config or database
-        team_names = ["Hawks", "Sharks", "Lions", "Dragons", "Vipers", "Bears", "Wolves", "Panthers"]
-        team_abbrs = ["HAW", "SHK", "LIO", "DRA", "VIP", "BER", "WOL", "PAN"]
+    def __getattr__(self, name):
+        """Materializes attributes deferred by defer_load the first time they are used."""
+        deferred = self.__dict__.get("_deferred")
+        if deferred and name in deferred:
+            value = deferred.pop(name)()
+            setattr(self, name, value)
+            return value
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
 
-        for i in range(len(team_names)):
-            self.all_teams.append(Team(team_names[i], team_abbrs[i]))
+    def defer_load(self, **loaders):
+        """Replaces attributes with zero-argument loaders that run on first access."""
+        for name in loaders:
+            self.__dict__.pop(name, None)
+        self.__dict__.setdefault("_deferred", {}).update(loaders)
 
-        # Assign a default user team for demonstration
-        self.user_team = self.all_teams[0] # Let's say the first team is the user's team
+    def _adopt(self, loaded_game):
+        """Takes over the state of a loaded game, including anything it has not loaded yet."""
+        self.__dict__.clear()
+        self.__dict__.update(loaded_game.__dict__)
 
     def start_new_game(self, num_draft_players=20, num_teams=4):
         """Sets up a new game, including generating draft players and teams."""
-        print("Starting a New Game...")
-        # Re-initialize teams if we want a fresh set
+        from data_loaders import registry
+        from players_and_draft import Draft, Team
+
+        if self.verbose:
+            print("Starting a New Game...")
+        # Teams are only built here, once the league size is known
         self.all_teams = []
-        team_names = ["Hawks", "Sharks", "Lions", "Dragons", "Vipers", "Bears", "Wolves", "Panthers"]
-        team_abbrs = ["HAW", "SHK", "LIO", "DRA", "VIP", "BER", "WOL", "PAN"]
-        
-        for i in range(min(num_teams, len(team_names))): # Ensure we don't go out of bounds
-            self.all_teams.append(Team(team_names[i], team_abbrs[i]))
+        for name, abbr in registry.league_teams(num_teams): # Names get numbered past the league file's list
+            self.all_teams.append(Team(name, abbr))
 
         self.user_team = self.all_teams[0] # User controls the first team
         
-        self.draft = Draft(num_draft_players=num_draft_players, num_teams=len(self.all_teams))
+        self.draft = Draft(num_draft_players=num_draft_players, num_teams=len(self.all_teams),
+                           rng=self.rng.child("season", 1, "draft"), reporter=self.reporter)
         self.draft.teams = self.all_teams # Link the Draft's teams to the Game's teams
 
         self.current_season = 1
         self.current_week = 0
+        self.schedule = []
+        self.standings = None
+        self.season_simulator = None
         self.current_state = "DRAFT" # Move to the draft state
 
+        if self.autosave:
+            from save_journal import SaveJournal
+            self.journal = SaveJournal(os.path.join(self.save_directory, self.AUTOSAVE_FILENAME))
+            self.journal.start(self)
+
+    @timed("state.DRAFT.run_draft_phase")
     def run_draft_phase(self):
         """Manages the draft process."""
-        print("\n--- Entering Draft Phase ---")
+        if self.verbose:
+            print("\n--- Entering Draft Phase ---")
         if not self.draft:
             print("Error: Draft not initialized.")
             return
 
-        self.draft.run_draft() # Execute the automated draft
+        from draft_ai import NeedBasedStrategy
+
+        on_pick = None
+        if self.journal:
+            # Each pick is journaled as it is made and committed at the end of every round,
+            # so a crash mid-draft loses at most the round in progress
+            team_index = {id(team): i for i, team in enumerate(self.all_teams)}
+            picks_per_round = len(self.draft.teams)
+
+            def on_pick(team, row):
+                self.journal.record_pick(team_index[id(team)], row)
+                if self.draft.current_pick % picks_per_round == 0:
+                    self.journal.commit(self)
 
-        print("\n--- Draft Results ---")
-        for team in self.all_teams:
-            print(f"\n{team.name} ({team.abbreviation}) Roster:")
-            for player in team.roster:
-                print(f"  - {player.name} ({player.position}) - Ovr: {player.get_overall_rating()}")
+        # Execute the automated draft; every team drafts for its open starter slots
+        self.draft.run_draft(strategy=NeedBasedStrategy(), on_pick=on_pick)
+
+        if self.verbose:
+            print("\n--- Draft Results ---")
+            for team in self.all_teams:
+                print(f"\n{team.name} ({team.abbreviation}) Roster:")
+                for player in team.roster:
+                    print(f"  - {player.name} ({player.position}) - Ovr: {player.get_overall_rating()}")
 
         self.current_state = "SEASON" # After draft, move to season
+        self.start_season()
+
+        if self.journal:
+            self.journal.record_state(self.current_state) # Along with the last round's picks, if it was cut short
+            self.journal.commit(self)
+
+    def start_season(self):
+        """Builds the season's schedule and empty standings, aligned into conferences and divisions."""
+        from data_loaders import registry
+        from standings import StandingsTable
+
+        self.current_week = 0
+        self.schedule = []
+        self.standings = StandingsTable(self.all_teams, registry.alignment(len(self.all_teams)))
+        self.season_simulator = None
+        self._season_simulator()
 
+    def _season_simulator(self):
+        """The simulator for the current season, rebuilt from the saved schedule and standings if needed."""
+        if self.season_simulator is None:
+            from simulation import SeasonSimulator
+            if self.standings is None:
+                from data_loaders import registry
+                from standings import StandingsTable
+                self.standings = StandingsTable(self.all_teams, registry.alignment(len(self.all_teams)))
+            if self.stats is None:
+                from season_stats import SeasonStats
+                self.stats = SeasonStats(self.all_teams)
+            self.season_simulator = SeasonSimulator(
+                self.all_teams, weeks=self.SEASON_WEEKS, engine="batch",
+                rng=self.rng.child("season", self.current_season), reporter=self.reporter,
+                schedule=self.schedule or None, standings=self.standings,
+                season=self.current_season, stats=self.stats)
+            self.schedule = self.season_simulator.schedule
+        return self.season_simulator
+
+    @timed("state.SEASON.advance_week")
     def advance_week(self):
-        """Advances the game to the next week of the season."""
+        """Simulates the next week of the schedule and advances the game to it."""
         if self.current_state != "SEASON":
             print("Can only advance week during season.")
             return
 
+        simulator = self._season_simulator()
+        if self.verbose:
+            print(f"\n--- Advancing to Week {self.current_week + 1} of Season {self.current_season} ---")
+        results = simulator.play_week(self.current_week) # Every week draws from its own RNG stream
         self.current_week += 1
-        print(f"\n--- Advancing to Week {self.current_week} of Season {self.current_season} ---")
-
-        # In a real game, this is where you'd simulate games for the week
-        # generate stats, check injuries, etc.
 
-        # For demonstration: print user team roster
-        print(f"User Team: {self.user_team.name}")
-        print("Roster:")
-        for player in self.user_team.roster:
-            print(f"  - {player.name} ({player.position})")
+        if self.verbose and self.user_team:
+            record = self.standings.record(self.user_team)
+            print(f"User Team: {record} - {self.standings.rank(self.user_team)} of {len(self.all_teams)}")
+            print("Roster:")
+            for player in self.user_team.roster:
+                print(f"  - {player.name} ({player.position})")
 
-        # Example condition to end season (e.g., after 17 weeks)
-        if self.current_week > 17:
-            print("\n--- Season Ended! ---")
+        if self.current_week >= len(self.schedule):
+            simulator.end_season()
+            if self.verbose:
+                print("\n--- Season Ended! ---")
             self.current_state = "END_GAME" # Or "OFFSEASON", "PLAYOFFS" etc.
 
+        if self.journal:
+            team_index = {id(team): i for i, team in enumerate(self.all_teams)}
+            self.journal.record_week(self.current_season, self.current_week, [
+                (team_index[id(game.home_team)], team_index[id(game.away_team)],
+                 game.score[game.home_team.name], game.score[game.away_team.name]) for game in results])
+            if self.current_state != "SEASON":
+                self.journal.record_state(self.current_state)
+            self.journal.commit(self)
+
+    @timed("state.END_GAME.start_next_season")
+    def start_next_season(self):
+        """Runs the offseason (aging, development, retirements, new draft class) and opens the next draft."""
+        if self.current_state != "END_GAME":
+            print("The next season can only start once this one has ended.")
+            return
+        from market import TradeMarket, undrafted_players
+        from offseason import OffseasonEngine
+
+        if self.offseason is None:
+            self.offseason = OffseasonEngine(rng=self.rng, reporter=self.reporter)
+        # Worst record picks first in the new draft
+        draft_order = [record.team for record in reversed(self.standings.ranked())] if self.standings is not None else None
+        self.current_season += 1
+        previous_draft = self.draft
+        self.draft = self.offseason.run(self.all_teams, self.current_season, first_id=self._next_player_id(),
+                                        draft_order=draft_order, run_draft=False)
+        self.current_week = 0
+        self.schedule = []
+        self.standings = None
+        self.season_simulator = None
+        self.current_state = "DRAFT"
+        if self.journal:
+            self.journal.start(self) # Every roster changed, so start from a fresh snapshot
+
+        # AI teams trade and sign last year's undrafted prospects; the user's roster is left alone.
+        # The moves are journaled on top of the snapshot just written.
+        free_agents = undrafted_players(previous_draft) if previous_draft is not None else ()
+        market = TradeMarket(self.all_teams, rng=self.rng.child("market", self.current_season),
+                             free_agents=free_agents, locked=[self.user_team] if self.user_team else (),
+                             journal=self.journal, reporter=self.reporter)
+        market.run_cycle()
+        if self.journal:
+            self.journal.commit(self)
+        if self.stats is not None:
+            # Retired players' career totals go, apart from those still on a career leaderboard
+            active = {player.player_id for team in self.all_teams for player in team.roster}
+            self.stats.retire([player_id for player_id in self.stats.career_players() if player_id not in active])
+
+    def _next_player_id(self):
+        """First player_id not used by any rostered player or the last draft class."""
+        ids = [player.player_id for team in self.all_teams for player in team.roster if player.player_id is not None]
+        if self.draft is not None:
+            ids.append(self.draft.pool.first_id + len(self.draft.pool) - 1)
+        return max(ids, default=-1) + 1
+
+    @timed("game.save")
     def save_game(self, filename="game_save.dat"):
         """Saves the current game state to a file."""
+        import save_format
         filepath = os.path.join(self.save_directory, filename)
         try:
-            with open(filepath, 'wb') as f:
-                pickle.dump(self, f)
-            print(f"Game saved successfully to {filepath}")
+            save_format.write_game(self, filepath)
+            if self.reporter.enabled:
+                self.reporter.emit("game_saved", path=filepath)
         except Exception as e:
             print(f"Error saving game: {e}")
 
     @staticmethod
-    def load_game(filename="game_save.dat", save_dir="saves"):
+    @timed("game.load")
+    def load_game(filename="game_save.dat", save_dir="saves", reporter=CONSOLE, verbose=True):
         """Loads a game state from a file."""
+        import save_format
         filepath = os.path.join(save_dir, filename)
         try:
-            with open(filepath, 'rb') as f:
-                game_instance = pickle.load(f)
-            print(f"Game loaded successfully from {filepath}")
+            if save_format.is_versioned_save(filepath):
+                game_instance = save_format.read_game(Game(save_dir, reporter=reporter, verbose=verbose), filepath)
+            else:
+                # Saves from before the versioned format; the next save_game converts them
+                game_instance = Game(save_dir) # Defaults for anything added since the old save
+                game_instance.__dict__.update(save_format.read_legacy_pickle(filepath).__dict__)
+                game_instance.reporter = reporter
+                game_instance.verbose = verbose
+                if game_instance.draft:
+                    game_instance.draft.reporter = reporter
+                print("Loaded an older save file. Saving will upgrade it to the new format.")
+            game_instance.save_directory = save_dir
+            if verbose:
+                print(f"Game loaded successfully from {filepath}")
             return game_instance
         except FileNotFoundError:
             print(f"No save file found at {filepath}")
@@ -121,6 +284,65 @@ class Game:
             print(f"Error loading game: {e}")
             return None
 
+    @staticmethod
+    def load_autosave(save_dir="saves"):
+        """Loads the autosave snapshot and replays its journal on top of it."""
+        from save_journal import SaveJournal
+        game = Game.load_game(Game.AUTOSAVE_FILENAME, save_dir)
+        if game:
+            game.journal = SaveJournal(os.path.join(save_dir, Game.AUTOSAVE_FILENAME))
+            game.journal.replay(game)
+            game.autosave = True
+        return game
+
+    # --- Headless commands ---
+    # The same lifecycle as the menus in run(), without any input() prompts, for scripts,
+    # the batch runner and the league server. Each command returns status().
+    def status(self):
+        """A JSON-friendly summary of where the game is."""
+        return {
+            "state": self.current_state,
+            "season": self.current_season,
+            "week": self.current_week,
+            "teams": [team.name for team in self.all_teams],
+            "user_team": self.user_team.name if self.user_team else None,
+        }
+
+    def new_game(self, num_draft_players=20, num_teams=4):
+        self.start_new_game(num_draft_players=num_draft_players, num_teams=num_teams)
+        return self.status()
+
+    def run_draft(self):
+        if self.current_state != "DRAFT":
+            raise GameCommandError(f"Can't run the draft in state {self.current_state}")
+        self.run_draft_phase()
+        return self.status()
+
+    def advance_weeks(self, count=1):
+        """Advances up to count weeks, stopping early when the season ends."""
+        if self.current_state != "SEASON":
+            raise GameCommandError(f"Can't advance weeks in state {self.current_state}")
+        for _ in range(count):
+            if self.current_state != "SEASON":
+                break
+            self.advance_week()
+        return self.status()
+
+    def next_season(self):
+        if self.current_state != "END_GAME":
+            raise GameCommandError(f"Can't start the next season in state {self.current_state}")
+        self.start_next_season()
+        return self.status()
+
+    def save(self, filename="game_save.dat"):
+        """Writes a save file, raising on failure instead of printing."""
+        import save_format
+        filepath = os.path.join(self.save_directory, filename)
+        save_format.write_game(self, filepath)
+        if self.reporter.enabled:
+            self.reporter.emit("game_saved", path=filepath)
+        return dict(self.status(), path=filepath)
+
     def run(self):
         """Main game loop/state machine handler."""
         print("Game initialized. Current state:", self.current_state)
@@ -139,7 +361,7 @@ class Game:
                 loaded_game = Game.load_game()
                 if loaded_game:
                     # Replace current game instance with loaded one
-                    self.__dict__.update(loaded_game.__dict__)
+                    self._adopt(loaded_game)
                     print("Game loaded. Current state:", self.current_state)
             elif choice == "3":
                 self.current_state = "EXITING"
@@ -147,6 +369,7 @@ class Game:
                 return
 
         while self.current_state != "EXITING":
+            state_before = self.current_state
             if self.current_state == "DRAFT":
                 self.run_draft_phase()
                 # Automatically transition to SEASON after draft
@@ -178,7 +401,7 @@ class Game:
                 elif choice == "3":
                     loaded_game = Game.load_game()
                     if loaded_game:
-                        self.__dict__.update(loaded_game.__dict__)
+                        self._adopt(loaded_game)
                         print("Game loaded. Current state:", self.current_state)
                 elif choice == "4":
                     self.current_state = "EXITING"
@@ -188,12 +411,15 @@ class Game:
                     print("Invalid choice or no game to continue.")
             elif self.current_state == "END_GAME":
                 print("\n--- Game Over / Offseason ---")
-                print("1. Start New Game")
-                print("2. Exit to Main Menu")
+                print("1. Continue to Next Season")
+                print("2. Start New Game")
+                print("3. Exit to Main Menu")
                 choice = input("Enter your choice: ")
                 if choice == "1":
-                    self.start_new_game(num_draft_players=20, num_teams=2)
+                    self.start_next_season()
                 elif choice == "2":
+                    self.start_new_game(num_draft_players=20, num_teams=2)
+                elif choice == "3":
                     self.current_state = "MAIN_MENU"
                 else:
                     print("Invalid choice.")
@@ -205,8 +431,17 @@ class Game:
                 # Fallback or error handling
                 self.current_state = "MAIN_MENU"
 
+            if PROFILER.enabled and self.current_state != state_before:
+                PROFILER.count(f"transition.{state_before}->{self.current_state}")
+
 
 # Example Usage (typically run from your main.py or __main__.py file)
 if __name__ == "__main__":
+    profiling = PROFILER.enable_from_env() # e.g. RETRO_FOOTBALL_PROFILE=trace,cprofile
     game = Game()
     game.run()
+    if profiling:
+        PROFILER.print_summary()
+        if PROFILER.trace:
+            PROFILER.export_chrome_trace("profile_trace.json")
+        PROFILER.dump_cprofile("profile.prof")
@@ -0,0 +1,190 @@
+# gameplay.py
+import random
+
+from batch_engine import (DRIVES_PER_TEAM, FIELD_GOAL_POINTS, HOME_FIELD_EDGE, TOUCHDOWN_POINTS,
+                          drive_chances)
+from play_log import NO_PLAYER, PLAY_CODES, new_play_columns
+
+# Play model. Drive outcomes come from the shared drive model in batch_engine, so per-game
+# scores match the batch engine; the plays below fill in how each drive got there.
+START_YARD_LINE = 25    # Drives start at the offense's own 25
+FIELD_GOAL_RANGE = 62   # Yard line from which a field goal is tried
+PASS_SHARE = 0.55       # Share of scrimmage plays that are passes
+COMPLETION_CHANCE = 0.62
+SACK_CHANCE = 0.06
+TURNOVER_SHARE = 0.25   # Share of empty drives that end in a turnover instead of a punt
+MAX_DRIVE_PLAYS = 18    # Scoring drives break a big play after this many snaps
+
+_TOUCHDOWN, _FIELD_GOAL, _EMPTY = range(3)
+
+
+def _player_id(players):
+    return players[0].player_id if players and players[0].player_id is not None else NO_PLAYER
+
+
+class Gameplay:
+    """
+    Simulates one game play by play. Each drive's result is drawn from the same drive model
+    the batch engine uses; the drive is then played out snap by snap (down, distance, yard
+    line, ball carrier, tackler) and every play is kept in columns ready for a PlayLog.
+    """
+
+    def __init__(self, home_team, away_team, rng=None, play_log=None, season=0, week=0):
+        self.home_team = home_team
+        self.away_team = away_team
+        self.rng = rng if rng is not None else random
+        self.play_log = play_log # Where the finished game's plays are appended, if anywhere
+        self.season = season
+        self.week = week
+        self.score = {home_team.name: 0, away_team.name: 0}
+        self.plays = new_play_columns()
+        self.game_id = 0 # Position in the play log, assigned when the game starts
+
+    def start_game(self):
+        """Plays every drive, settles a tie with an overtime field goal and logs the plays."""
+        if self.play_log is not None:
+            self.game_id = self.play_log.next_game_id()
+        home_off, home_def = self.home_team.ratings.vector
+        away_off, away_def = self.away_team.ratings.vector
+        home_chances = drive_chances(home_off + HOME_FIELD_EDGE, away_def)
+        away_chances = drive_chances(away_off, home_def)
+
+        drive = 0
+        for _ in range(DRIVES_PER_TEAM):
+            for side, (td, fg) in ((0, home_chances), (1, away_chances)):
+                u = self.rng.random()
+                outcome = _TOUCHDOWN if u < td else _FIELD_GOAL if u < td + fg else _EMPTY
+                self._play_drive(drive, side, outcome)
+                drive += 1
+
+        home, away = self.home_team.name, self.away_team.name
+        if self.score[home] == self.score[away]:
+            # Same sudden-death rule as the batch engine
+            home_share = home_chances[0] / (home_chances[0] + away_chances[0])
+            side = 0 if self.rng.random() < home_share else 1
+            self._kick_field_goal(drive, side, 3, 10, FIELD_GOAL_RANGE)
+
+        if self.play_log is not None:
+            self.game_id = self.play_log.append_game(self, self.plays, self.season, self.week)
+
+    # --- Drives ---
+    def _units(self, side):
+        offense, defense = (self.home_team, self.away_team) if side == 0 else (self.away_team, self.home_team)
+        return offense, offense.ratings, defense.ratings
+
+    def _play_drive(self, drive, side, outcome):
+        rng = self.rng
+        _, offense, defense = self._units(side)
+        turnover_at = None
+        if outcome == _EMPTY and rng.random() < TURNOVER_SHARE:
+            turnover_at = rng.randint(1, 6) # Snap on which the ball is given away
+
+        down, distance, yard_line, snaps = 1, 10, START_YARD_LINE, 0
+        while True:
+            if outcome == _FIELD_GOAL and (yard_line >= FIELD_GOAL_RANGE and (down == 4 or rng.random() < 0.3)):
+                self._kick_field_goal(drive, side, down, distance, yard_line)
+                return
+            if outcome == _EMPTY and down == 4:
+                self._record(drive, side, down, distance, yard_line, "punt", NO_PLAYER, NO_PLAYER,
+                             _player_id(defense.starters("S")), 0, 0)
+                return
+
+            snaps += 1
+            passing = rng.random() < PASS_SHARE
+            play_type, yards = self._snap(passing)
+            if turnover_at is not None and snaps >= turnover_at:
+                play_type = "interception" if passing else "fumble"
+                yards = 0
+
+            if outcome != _EMPTY and play_type not in ("interception", "fumble"):
+                # Scoring drives keep the chains moving and break a long play if they stall
+                if down >= 3 and yards < distance:
+                    play_type, yards = ("pass" if passing else "run"), distance + rng.randint(0, 4)
+                if snaps >= MAX_DRIVE_PLAYS:
+                    play_type, yards = "pass", 100 - yard_line
+            yards = min(max(yards, 1 - yard_line), 127)
+
+            touchdown = yard_line + yards >= 100
+            if touchdown and outcome != _TOUCHDOWN:
+                yards = 99 - yard_line # Stop short; this drive doesn't end in the end zone
+                touchdown = False
+
+            passer = _player_id(offense.starters("QB")) if passing else NO_PLAYER
+            if play_type in ("run", "fumble"):
+                carrier = _player_id(offense.starters("RB"))
+            elif play_type in ("pass", "interception", "incomplete"):
+                carrier = _player_id(rng.choice((offense.starters("WR"), offense.starters("TE"))))
+            else:
+                carrier = passer # Sacks are charged to the passer
+            tackler = _player_id(rng.choice((defense.starters("LB"), defense.starters("CB"),
+                                             defense.starters("S"), defense.starters("DE"))))
+            points = TOUCHDOWN_POINTS if touchdown else 0
+            self._record(drive, side, down, distance, yard_line, play_type, passer, carrier, tackler, yards, points)
+
+            if touchdown or play_type in ("interception", "fumble"):
+                return
+            yard_line += yards
+            if yards >= distance:
+                down, distance = 1, min(10, 100 - yard_line)
+            else:
+                down, distance = down + 1, distance - yards
+
+    def _snap(self, passing):
+        """Draws one scrimmage play: (play type, yards gained)."""
+        rng = self.rng
+        if not passing:
+            return "run", int(rng.gauss(4.2, 3.5))
+        if rng.random() < SACK_CHANCE:
+            return "sack", -rng.randint(3, 10)
+        if rng.random() < COMPLETION_CHANCE:
+            return "pass", max(int(rng.gauss(11, 7)), 0)
+        return "incomplete", 0
+
+    def _kick_field_goal(self, drive, side, down, distance, yard_line):
+        self._record(drive, side, down, distance, yard_line, "field_goal", NO_PLAYER, NO_PLAYER, NO_PLAYER,
+                     0, FIELD_GOAL_POINTS)
+
+    def _record(self, drive, side, down, distance, yard_line, play_type, passer, player, defender, yards, points):
+        plays = self.plays
+        plays["game"].append(self.game_id)
+        plays["drive"].append(min(drive, 255))
+        plays["offense"].append(side)
+        plays["down"].append(down)
+        plays["distance"].append(max(min(distance, 255), 0))
+        plays["yard_line"].append(yard_line)
+        plays["play_type"].append(PLAY_CODES[play_type])
+        plays["passer"].append(passer)
+        plays["player"].append(player)
+        plays["defender"].append(defender)
+        plays["yards"].append(yards)
+        plays["points"].append(points)
+        if points:
+            scorer = self.home_team if side == 0 else self.away_team
+            self.score[scorer.name] += points
+
+
+# Example Usage: play one game into a throwaway play log and replay it from the mapped files
+if __name__ == "__main__":
+    import tempfile
+
+    from play_log import PLAY_TYPES, PlayLog, PlayLogReader
+    from players_and_draft import Draft
+
+    draft = Draft(num_draft_players=88, num_teams=2, verbose=False)
+    draft.run_draft()
+    home_team, away_team = draft.teams
+
+    with tempfile.TemporaryDirectory() as directory:
+        with PlayLog(directory) as log:
+            game = Gameplay(home_team, away_team, play_log=log, season=1, week=1)
+            game.start_game()
+        print(f"Final: {away_team.name} {game.score[away_team.name]} @ {home_team.name} {game.score[home_team.name]}")
+
+        with PlayLogReader(directory) as reader:
+            print(f"\nFirst plays of game {game.game_id} ({len(list(reader.play_rows(game.game_id)))} plays):")
+            for play in list(reader.replay(game.game_id))[:10]:
+                print(f"  Drive {play.drive:>2} {play.down}&{play.distance:<2} at {play.yard_line:>2}: "
+                      f"{PLAY_TYPES[play.play_type]:<12} {play.yards:>3} yds")
+            leaders = reader.yards_by_player("run").most_common(1)
+            if leaders:
+                print(f"\nTop rusher: player {leaders[0][0]} with {leaders[0][1]} yards")
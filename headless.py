@@ -0,0 +1,240 @@
+# headless.py
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from events import SILENT, JsonlSink, Reporter
+from game_state_manager import Game, GameCommandError
+
+DEFAULT_WEEKS = 17
+
+
+# --- Batch runner ---
+def _league_configs(config):
+    """Expands the config's leagues, giving each of a league's copies its own name and seed."""
+    defaults = config.get("defaults", {})
+    for league in config.get("leagues", []):
+        league = dict(defaults, **league)
+        copies = league.pop("copies", 1)
+        for i in range(copies):
+            entry = dict(league)
+            if copies > 1:
+                entry["name"] = f"{league['name']}-{i + 1}"
+                if entry.get("seed") is not None:
+                    entry["seed"] = league["seed"] + i
+            yield entry
+
+
+def run_league(league, save_dir):
+    """
+    Runs one league from a new game through its drafts and seasons, then saves it.
+    Every season but the last is played out in full; the last stops after "weeks" weeks.
+    """
+    name = league["name"]
+    sink = None
+    reporter = SILENT
+    if league.get("events"):
+        sink = JsonlSink(os.path.join(save_dir, f"{name}.events.jsonl"))
+        reporter = Reporter(sink)
+
+    game = Game(os.path.join(save_dir, name), seed=league.get("seed"), reporter=reporter, verbose=False)
+    try:
+        game.new_game(num_draft_players=league.get("num_draft_players", 20), num_teams=league.get("num_teams", 4))
+        seasons = league.get("seasons", 1)
+        for season in range(seasons):
+            if season:
+                game.next_season()
+            game.run_draft()
+            last = season == seasons - 1
+            status = game.advance_weeks(league.get("weeks", DEFAULT_WEEKS) if last else len(game.schedule))
+        if league.get("save", True):
+            status = game.save(f"{name}.dat")
+    finally:
+        if sink is not None:
+            sink.close()
+    return dict(status, name=name)
+
+
+def run_batch(config, workers=None):
+    """
+    Runs every league in a batch config and returns their final statuses in config order.
+    Config format (JSON):
+        {"save_dir": "saves/batch", "workers": 4,
+         "defaults": {"num_teams": 8, "num_draft_players": 200, "weeks": 17, "seasons": 1},
+         "leagues": [{"name": "alpha", "seed": 1, "copies": 10, "events": true}, ...]}
+    """
+    save_dir = config.get("save_dir", os.path.join("saves", "batch"))
+    os.makedirs(save_dir, exist_ok=True)
+    leagues = list(_league_configs(config))
+    workers = workers or config.get("workers", 1)
+    if workers <= 1 or len(leagues) <= 1:
+        return [run_league(league, save_dir) for league in leagues]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_league, leagues, [save_dir] * len(leagues)))
+
+
+# --- League server ---
+class LeagueServer:
+    """
+    Hosts many Game instances in one process and drives them from JSON-lines requests:
+        {"id": 1, "cmd": "new", "game": "alpha", "args": {"seed": 7, "num_teams": 8}}
+    and answers each with {"id": 1, "ok": true, "result": {...}} or {"id": 1, "ok": false, "error": "..."}.
+    Requests for different games run interleaved on the event loop; requests for the same
+    game run one at a time in the order they arrived. Long commands give way between weeks.
+    """
+
+    COMMANDS = ("new", "draft", "advance", "next_season", "save", "load", "status", "close", "list")
+
+    def __init__(self, save_dir=os.path.join("saves", "server"), max_games=1000):
+        self.save_dir = save_dir
+        self.max_games = max_games
+        self.games = {}  # game id -> Game
+        self._locks = {} # game id -> asyncio.Lock, serializing commands per game
+        self._next_id = 1
+
+    async def handle(self, request):
+        """Runs one request and returns its response."""
+        response = {"id": request.get("id")}
+        command = request.get("cmd")
+        try:
+            if command not in self.COMMANDS:
+                raise GameCommandError(f"Unknown command '{command}'. Choose from {self.COMMANDS}.")
+            if command == "list":
+                result = {game_id: game.status() for game_id, game in self.games.items()}
+            else:
+                game_id = request.get("game")
+                if game_id is None and command == "new":
+                    game_id = f"game-{self._next_id}"
+                    self._next_id += 1
+                lock = self._locks.setdefault(game_id, asyncio.Lock())
+                async with lock:
+                    result = await self._run(command, game_id, request.get("args", {}))
+            response.update(ok=True, result=result)
+        except (GameCommandError, KeyError, TypeError, ValueError, OSError) as e:
+            response.update(ok=False, error=str(e))
+        return response
+
+    async def _run(self, command, game_id, args):
+        if command in ("new", "load"):
+            if game_id not in self.games and len(self.games) >= self.max_games:
+                raise GameCommandError(f"Server is full ({self.max_games} games)")
+            game_dir = os.path.join(self.save_dir, game_id)
+            if command == "new":
+                game = Game(game_dir, seed=args.get("seed"), reporter=SILENT, verbose=False)
+                game.new_game(num_draft_players=args.get("num_draft_players", 20),
+                              num_teams=args.get("num_teams", 4))
+            else:
+                game = Game.load_game(args.get("filename", "game_save.dat"), game_dir, reporter=SILENT, verbose=False)
+                if game is None:
+                    raise GameCommandError(f"Could not load '{args.get('filename', 'game_save.dat')}' for {game_id}")
+            self.games[game_id] = game
+            return dict(game.status(), game=game_id)
+
+        game = self.games.get(game_id)
+        if game is None:
+            raise GameCommandError(f"No game '{game_id}'")
+        if command == "draft":
+            return game.run_draft()
+        if command == "advance":
+            status = game.status()
+            for _ in range(args.get("weeks", 1)):
+                status = game.advance_weeks(1)
+                if game.current_state != "SEASON":
+                    break
+                await asyncio.sleep(0) # Let other games' requests run between weeks
+            return status
+        if command == "next_season":
+            return game.next_season()
+        if command == "save":
+            return game.save(args.get("filename", "game_save.dat"))
+        if command == "status":
+            return game.status()
+        # close
+        del self.games[game_id]
+        self._locks.pop(game_id, None)
+        return {"closed": game_id}
+
+    async def _answer(self, line, write):
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("A request must be a JSON object")
+        except ValueError as e:
+            response = {"id": None, "ok": False, "error": f"Bad request: {e}"}
+        else:
+            response = await self.handle(request)
+        await write(json.dumps(response, separators=(",", ":")) + "\n")
+
+    async def serve_connection(self, reader, writer):
+        """Serves one socket client until it disconnects; its requests may overlap."""
+        async def write(text):
+            writer.write(text.encode())
+            await writer.drain()
+
+        pending = set()
+        while line := await reader.readline():
+            if line.strip():
+                task = asyncio.create_task(self._answer(line, write))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.gather(*pending)
+        writer.close()
+
+    async def serve_socket(self, path=None, host="127.0.0.1", port=None):
+        """Listens on a Unix socket at path, or on host:port over TCP."""
+        if path is not None:
+            server = await asyncio.start_unix_server(self.serve_connection, path)
+        else:
+            server = await asyncio.start_server(self.serve_connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_stdio(self):
+        """Reads requests from stdin and writes responses to stdout until stdin closes."""
+        loop = asyncio.get_running_loop()
+        out = sys.stdout
+
+        async def write(text):
+            out.write(text)
+            out.flush()
+
+        pending = set()
+        # Anything the game itself prints goes to stderr so stdout stays pure JSON lines
+        with contextlib.redirect_stdout(sys.stderr):
+            while line := await loop.run_in_executor(None, sys.stdin.readline):
+                if line.strip():
+                    task = asyncio.create_task(self._answer(line, write))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run Retro Football leagues without the interactive menus")
+    commands = parser.add_subparsers(dest="command", required=True)
+    batch = commands.add_parser("batch", help="Run every league in a JSON config file")
+    batch.add_argument("config")
+    batch.add_argument("--workers", type=int, help="Processes to spread the leagues over")
+    serve = commands.add_parser("serve", help="Serve JSON-lines requests on stdin, a Unix socket or TCP")
+    serve.add_argument("--socket", help="Unix socket path")
+    serve.add_argument("--port", type=int, help="TCP port on 127.0.0.1")
+    serve.add_argument("--save-dir", default=os.path.join("saves", "server"))
+    args = parser.parse_args()
+
+    if args.command == "batch":
+        with open(args.config, 'r') as f:
+            config = json.load(f)
+        for status in run_batch(config, args.workers):
+            print(json.dumps(status))
+    else:
+        server = LeagueServer(args.save_dir)
+        if args.socket or args.port:
+            asyncio.run(server.serve_socket(path=args.socket, port=args.port))
+        else:
+            asyncio.run(server.serve_stdio())
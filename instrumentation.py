@@ -0,0 +1,200 @@
+# instrumentation.py
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+
+class _NullTimer:
+    """Shared do-nothing context manager handed out while profiling is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler._record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class Profiler:
+    """
+    Opt-in timers and counters for the game's hot paths.
+    While disabled, timer() returns a shared no-op context manager and functions marked
+    with timed() are left unwrapped: enable() installs the timing wrappers on their
+    classes and modules and disable() puts the originals back, so instrumentation can
+    stay in the code permanently.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace = False     # Also keep every timed span for the Chrome trace export
+        self.timings = {}      # name -> [calls, total ns, max ns]
+        self.counters = {}     # name -> count
+        self.spans = []        # (name, start ns, end ns, thread id) when tracing
+        self._origin = time.perf_counter_ns()
+        self._cprofile = None
+        self._lock = threading.Lock()
+        self._instrumented = [] # (function, label) registered by timed()
+
+    # --- Switching on and off ---
+    def enable(self, trace=False, cprofile=False):
+        if not self.enabled:
+            self.enabled = True
+            self._install(active=True)
+        self.trace = trace
+        if cprofile and self._cprofile is None:
+            import cProfile # Only loaded when asked for, to keep it out of startup
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def disable(self):
+        if self.enabled:
+            self.enabled = False
+            self._install(active=False)
+        if self._cprofile is not None:
+            self._cprofile.disable()
+
+    def enable_from_env(self, variable="RETRO_FOOTBALL_PROFILE"):
+        """Enables profiling when the variable is set: "1", "trace" or "cprofile" (comma separated)."""
+        options = os.environ.get(variable, "")
+        if options:
+            flags = set(options.lower().split(","))
+            self.enable(trace="trace" in flags, cprofile="cprofile" in flags)
+        return self.enabled
+
+    def reset(self):
+        with self._lock:
+            self.timings.clear()
+            self.counters.clear()
+            self.spans.clear()
+        self._origin = time.perf_counter_ns()
+
+    # --- Recording ---
+    def timer(self, name):
+        """Context manager that times its block under name."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def timed(self, name=None):
+        """Decorator that times every call of a function (named after it unless name is given)."""
+        def decorate(func):
+            label = name or func.__qualname__
+            if "<locals>" in func.__qualname__:
+                # Nested functions can't be swapped later, so they check the switch per call
+                wrapper = self._wrap(func, label)
+                return functools.wraps(func)(lambda *args, **kwargs: (
+                    wrapper if self.enabled else func)(*args, **kwargs))
+            self._instrumented.append((func, label))
+            return self._wrap(func, label) if self.enabled else func
+        return decorate
+
+    def _wrap(self, func, label):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._record(label, start, time.perf_counter_ns())
+        return wrapper
+
+    def _install(self, active):
+        """Swaps the timed() functions for their wrappers (active) or back to the originals."""
+        for func, label in self._instrumented:
+            owner = sys.modules.get(func.__module__)
+            *path, attribute = func.__qualname__.split(".")
+            for part in path:
+                owner = getattr(owner, part, None)
+            if owner is None:
+                continue
+            replacement = self._wrap(func, label) if active else func
+            if isinstance(vars(owner).get(attribute), staticmethod):
+                replacement = staticmethod(replacement)
+            setattr(owner, attribute, replacement)
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + amount
+
+    def _record(self, name, start, end):
+        elapsed = end - start
+        with self._lock:
+            stats = self.timings.get(name)
+            if stats is None:
+                self.timings[name] = [1, elapsed, elapsed]
+            else:
+                stats[0] += 1
+                stats[1] += elapsed
+                if elapsed > stats[2]:
+                    stats[2] = elapsed
+            if self.trace:
+                self.spans.append((name, start, end, threading.get_ident()))
+
+    # --- Export ---
+    def summary_table(self):
+        """Returns the timings (slowest total first) and counters as a text table."""
+        lines = [f"| {'Timer':<32} | {'Calls':>8} | {'Total ms':>10} | {'Mean us':>10} | {'Max us':>10} |",
+                 "-" * 86]
+        for name, (calls, total, longest) in sorted(self.timings.items(), key=lambda item: -item[1][1]):
+            lines.append(f"| {name:<32} | {calls:>8} | {total / 1e6:>10.2f} | "
+                         f"{total / calls / 1e3:>10.1f} | {longest / 1e3:>10.1f} |")
+        if self.counters:
+            lines.append("")
+            lines.append(f"| {'Counter':<32} | {'Count':>8} |")
+            lines.append("-" * 47)
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"| {name:<32} | {value:>8} |")
+        return "\n".join(lines)
+
+    def print_summary(self):
+        print("\n--- Profile Summary ---")
+        print(self.summary_table())
+
+    def export_chrome_trace(self, filepath):
+        """Writes recorded spans as Chrome trace-event JSON (open in chrome://tracing or Perfetto)."""
+        pid = os.getpid()
+        events = [{"name": name, "ph": "X", "ts": (start - self._origin) / 1e3,
+                   "dur": (end - start) / 1e3, "pid": pid, "tid": tid}
+                  for name, start, end, tid in self.spans]
+        events.extend({"name": name, "ph": "C", "ts": 0, "pid": pid, "args": {"value": value}}
+                      for name, value in self.counters.items())
+        with open(filepath, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def dump_cprofile(self, filepath):
+        """Stops the cProfile run started by enable(cprofile=True) and writes its stats (read with pstats)."""
+        if self._cprofile is None:
+            return False
+        self._cprofile.disable()
+        self._cprofile.dump_stats(filepath)
+        self._cprofile = None
+        return True
+
+
+# Shared profiler used by the game modules
+PROFILER = Profiler()
+timer = PROFILER.timer
+timed = PROFILER.timed
+count = PROFILER.count
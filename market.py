@@ -0,0 +1,356 @@
+# market.py
+import random
+import time
+from bisect import bisect_left, insort
+
+from constants import ATTRIBUTE_MIN
+from events import SILENT
+from instrumentation import timed
+from offseason import DECLINE_AGE, DECLINE_PER_YEAR, GROWTH_RATE, PEAK_AGE
+from players_and_draft import TeamRatings
+
+FREE_AGENT = -1           # Team index of unsigned players (the same as save_format.NO_TEAM)
+RATING_BAND = 5           # Width of the overall rating bands in the index
+REPLACEMENT_LEVEL = ATTRIBUTE_MIN - 10 # What an empty starter slot plays like
+
+# Market behaviour
+MARKET_DAYS = 7           # Days in one market cycle
+NEEDS_PER_TEAM = 3        # Weakest positions a team shops for each day
+TARGETS_PER_NEED = 8      # Players looked at per need
+OFFERS_PER_TARGET = 4     # Players offered back per position the other team needs
+FUTURE_WEIGHT = 0.5       # Weight of expected development against current lineup value
+MIN_TRADE_GAIN = 1.0      # Both teams must gain at least this much for a trade to happen
+MIN_SIGNING_GAIN = 1.0
+MAX_ROSTER = 53
+
+
+def future_value(player):
+    """Expected change in a player's overall over the next offseason, the same curve OffseasonEngine uses."""
+    if player.age <= PEAK_AGE:
+        return max(player.potential - player.get_overall_rating(), 0) * GROWTH_RATE / 2
+    if player.age >= DECLINE_AGE:
+        return -(player.age - DECLINE_AGE + 1) * DECLINE_PER_YEAR / 2
+    return 0.0
+
+
+class LeagueIndex:
+    """
+    League-wide player indexes: by position (best overall first), by rating band, by team
+    and by age. Every roster change goes through add/remove/move so the indexes never
+    go stale, and queries start from the smallest matching index instead of scanning rosters.
+    Players without a player_id are given one past the highest id in the league.
+    """
+
+    def __init__(self, teams, free_agents=()):
+        self.teams = teams
+        self._team_index = {id(team): i for i, team in enumerate(teams)}
+        self.players = {}     # player_id -> Player
+        self._entries = {}    # player_id -> (position, overall, band, age, team index)
+        self.by_position = {} # position -> sorted [(-overall, player_id)]
+        self.by_band = {}     # overall // RATING_BAND -> {player_id}
+        self.by_team = {}     # team index (FREE_AGENT for unsigned players) -> {player_id}
+        self.by_age = {}      # age -> {player_id}
+        self._roster_depth = {} # (team index, position) -> sorted [(-overall, player_id)]
+        everyone = [player for team in teams for player in team.roster] + list(free_agents)
+        self._next_id = max((p.player_id for p in everyone if p.player_id is not None), default=-1) + 1
+        for i, team in enumerate(teams):
+            for player in team.roster:
+                self.add(player, i)
+        for player in free_agents:
+            self.add(player, FREE_AGENT)
+
+    def __len__(self):
+        return len(self.players)
+
+    def team_index(self, team):
+        return self._team_index[id(team)]
+
+    # --- Updates ---
+    def add(self, player, team=FREE_AGENT):
+        if player.player_id is None:
+            player.player_id = self._next_id
+        self._next_id = max(self._next_id, player.player_id + 1)
+        player_id = player.player_id
+        overall = player.get_overall_rating()
+        band = overall // RATING_BAND
+        self.players[player_id] = player
+        self._entries[player_id] = (player.position, overall, band, player.age, team)
+        insort(self.by_position.setdefault(player.position, []), (-overall, player_id))
+        insort(self._roster_depth.setdefault((team, player.position), []), (-overall, player_id))
+        self.by_band.setdefault(band, set()).add(player_id)
+        self.by_team.setdefault(team, set()).add(player_id)
+        self.by_age.setdefault(player.age, set()).add(player_id)
+
+    def remove(self, player_id):
+        position, overall, band, age, team = self._entries.pop(player_id)
+        del self.players[player_id]
+        for ranked in (self.by_position[position], self._roster_depth[team, position]):
+            del ranked[bisect_left(ranked, (-overall, player_id))]
+        self.by_band[band].discard(player_id)
+        self.by_team[team].discard(player_id)
+        self.by_age[age].discard(player_id)
+
+    def move(self, player_id, team):
+        """Re-files a player under another team index (FREE_AGENT when released)."""
+        position, overall, band, age, old_team = self._entries[player_id]
+        self.by_team[old_team].discard(player_id)
+        self.by_team.setdefault(team, set()).add(player_id)
+        depth = self._roster_depth[old_team, position]
+        del depth[bisect_left(depth, (-overall, player_id))]
+        insort(self._roster_depth.setdefault((team, position), []), (-overall, player_id))
+        self._entries[player_id] = (position, overall, band, age, team)
+
+    def update(self, player_id):
+        """Re-indexes a player whose attributes or age changed."""
+        team = self._entries[player_id][4]
+        player = self.players[player_id]
+        self.remove(player_id)
+        self.add(player, team)
+
+    # --- Queries ---
+    def team_of(self, player_id):
+        return self._entries[player_id][4]
+
+    def overall(self, player_id):
+        return self._entries[player_id][1]
+
+    def query(self, position=None, team=None, band=None, min_overall=None, min_age=None, max_age=None, limit=None,
+              exclude_teams=None):
+        """
+        Player ids matching every given filter, best overall first. min_overall stops the
+        walk down the position index early (the per-team one when team is given too); the
+        team, band and age indexes narrow the rest. exclude_teams skips players filed under
+        those team indexes, and limit counts only the players that are returned.
+        """
+        filters = []
+        if team is not None and position is None:
+            filters.append(self.by_team.get(team, set()))
+        if band is not None:
+            filters.append(self.by_band.get(band, set()))
+        if min_age is not None or max_age is not None:
+            low = min_age if min_age is not None else min(self.by_age, default=0)
+            high = max_age if max_age is not None else max(self.by_age, default=0)
+            filters.append(set().union(*(self.by_age.get(age, ()) for age in range(low, high + 1))))
+        filters.sort(key=len)
+
+        if position is not None:
+            # One team's players at a position have their own list, so roster queries stay short
+            entries = self.by_position.get(position, []) if team is None else self._roster_depth.get((team, position), [])
+            ranked = ((player_id, -negative) for negative, player_id in entries)
+        else:
+            ids = filters.pop(0) if filters else self.players.keys()
+            ranked = sorted(((player_id, self._entries[player_id][1]) for player_id in ids),
+                            key=lambda entry: (-entry[1], entry[0]))
+        matches = []
+        for player_id, overall in ranked:
+            if min_overall is not None and overall < min_overall:
+                break # Both orders are best first, so nothing further qualifies
+            if exclude_teams is not None and self._entries[player_id][4] in exclude_teams:
+                continue
+            if all(player_id in ids for ids in filters):
+                matches.append(player_id)
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+
+class TradeMarket:
+    """
+    AI trade and free-agency market. Each market day every team signs free agents who
+    would start for it, then shops its weakest starting positions: candidate one-for-one
+    trades are gathered from the league indexes for all teams at once, scored as a batch
+    (lineup gain minus lineup loss plus expected development, for both sides) and the best
+    deals that help both teams are made, at most one per team per day.
+    Moves go through Team.add_player/remove_player, the league index and the autosave
+    journal, so ratings, indexes and saves stay consistent.
+    """
+
+    def __init__(self, teams, rng=None, free_agents=(), locked=(), journal=None, reporter=SILENT):
+        self.teams = teams
+        self.rng = rng if rng is not None else random
+        self.index = LeagueIndex(teams, free_agents)
+        self.locked = {self.index.team_index(team) for team in locked} # e.g. the user's team
+        self.journal = journal
+        self.reporter = reporter
+        self.trades = []   # (day, team a, player id, team b, player id) per trade made
+        self.signings = [] # (day, team, player id) per free agent signed
+        self.candidates_scored = 0
+        self.day = 0
+        self._floors, self._backups = {}, {} # Team index -> _lineup_tables(), kept current as rosters change
+        self._refresh_tables(range(len(teams)))
+
+    # --- Team needs ---
+    def _lineup_tables(self, team_index):
+        """Per position: (weakest starter's overall or REPLACEMENT_LEVEL if a slot is open, best backup's overall)."""
+        ratings = self.teams[team_index].ratings
+        floors, backups = {}, {}
+        for position, slots in TeamRatings.LINEUP.items():
+            depth = ratings.depth_chart(position)
+            floors[position] = depth[slots - 1].get_overall_rating() if len(depth) >= slots else REPLACEMENT_LEVEL
+            backups[position] = depth[slots].get_overall_rating() if len(depth) > slots else REPLACEMENT_LEVEL
+        return floors, backups
+
+    def _refresh_tables(self, team_indexes):
+        for i in team_indexes:
+            self._floors[i], self._backups[i] = self._lineup_tables(i)
+
+    def gain(self, team_index, position, overall):
+        """How much a team's lineup improves by adding a player of this position and overall."""
+        return max(overall - self._floors[team_index][position], 0)
+
+    def loss(self, team_index, position, overall):
+        """How much a team's lineup drops if such a player leaves (zero for backups)."""
+        if overall < self._floors[team_index][position]:
+            return 0
+        return overall - self._backups[team_index][position]
+
+    def needs(self, team_index, count=NEEDS_PER_TEAM):
+        """The team's weakest starting positions, weakest first."""
+        floors = self._floors[team_index]
+        return sorted(floors, key=floors.__getitem__)[:count]
+
+    # --- Market days ---
+    @timed("market.cycle")
+    def run_cycle(self, days=MARKET_DAYS):
+        """Runs a market cycle and returns a summary of what happened."""
+        start = time.perf_counter()
+        trades, signings = len(self.trades), len(self.signings)
+        self._refresh_tables(range(len(self.teams))) # Rosters may have changed outside the market since the last cycle
+        for _ in range(days):
+            self.day += 1
+            self._sign_free_agents()
+            self._trade_round()
+        summary = {"days": days, "trades": len(self.trades) - trades, "signings": len(self.signings) - signings,
+                   "candidates": self.candidates_scored, "seconds": time.perf_counter() - start}
+        if self.reporter.enabled:
+            self.reporter.emit("market_end", **summary)
+        return summary
+
+    def _active_teams(self):
+        order = [i for i in range(len(self.teams)) if i not in self.locked]
+        self.rng.shuffle(order) # No team always gets first look
+        return order
+
+    def _sign_free_agents(self):
+        index = self.index
+        for i in self._active_teams():
+            for position in self.needs(i):
+                if len(self.teams[i].roster) >= MAX_ROSTER:
+                    break # Checked before every signing, so a day's signings can't pass the limit
+                floor = self._floors[i][position]
+                best = index.query(position=position, team=FREE_AGENT, min_overall=floor + MIN_SIGNING_GAIN, limit=1)
+                if best:
+                    self._move(best[0], i)
+                    self.signings.append((self.day, i, best[0]))
+                    self._refresh_tables((i,))
+
+    def gather_trades(self):
+        """Candidate one-for-one trades for every team as columns (team a, gets, team b, gets)."""
+        index = self.index
+        team_a, get_a, team_b, get_b = [], [], [], []
+        needs = {i: self.needs(i) for i in range(len(self.teams)) if i not in self.locked}
+        closed = self.locked | {FREE_AGENT} # Free agents are signed, not traded for
+        for a, wanted in needs.items():
+            excluded = closed | {a} # Players already theirs
+            for position in wanted:
+                for target in index.query(position=position, min_overall=self._floors[a][position] + MIN_TRADE_GAIN,
+                                          limit=TARGETS_PER_NEED, exclude_teams=excluded):
+                    b = index.team_of(target)
+                    for offer_position in needs[b]:
+                        if offer_position == position:
+                            continue
+                        for offer in index.query(position=offer_position, team=a,
+                                                 min_overall=self._floors[b][offer_position] + MIN_TRADE_GAIN,
+                                                 limit=OFFERS_PER_TARGET):
+                            team_a.append(a)
+                            get_a.append(target)
+                            team_b.append(b)
+                            get_b.append(offer)
+        return team_a, get_a, team_b, get_b
+
+    def score_trades(self, team_a, get_a, team_b, get_b):
+        """Scores candidate trades as a batch: the smaller of the two teams' net gains."""
+        index, gain, loss = self.index, self.gain, self.loss
+        # Per-player values, looked up once for every player in the batch
+        involved = set(get_a).union(get_b)
+        position = {p: index.players[p].position for p in involved}
+        overall = {p: index.overall(p) for p in involved}
+        future = {p: FUTURE_WEIGHT * future_value(index.players[p]) for p in involved}
+
+        scores = [
+            min(gain(a, position[p], overall[p]) - loss(a, position[q], overall[q]) + future[p] - future[q],
+                gain(b, position[q], overall[q]) - loss(b, position[p], overall[p]) + future[q] - future[p])
+            for a, p, b, q in zip(team_a, get_a, team_b, get_b)
+        ]
+        self.candidates_scored += len(scores)
+        return scores
+
+    def _trade_round(self):
+        team_a, get_a, team_b, get_b = self.gather_trades()
+        scores = self.score_trades(team_a, get_a, team_b, get_b)
+        traded = set()
+        for k in sorted(range(len(scores)), key=scores.__getitem__, reverse=True):
+            if scores[k] < MIN_TRADE_GAIN:
+                break
+            a, p, b, q = team_a[k], get_a[k], team_b[k], get_b[k]
+            if a in traded or b in traded:
+                continue # Lineup tables for these teams are stale until tomorrow
+            self._move(p, a)
+            self._move(q, b)
+            self.trades.append((self.day, a, p, b, q))
+            traded.update((a, b))
+        self._refresh_tables(traded)
+
+    def _move(self, player_id, to_team):
+        index = self.index
+        player = index.players[player_id]
+        from_team = index.team_of(player_id)
+        if from_team != FREE_AGENT:
+            self.teams[from_team].remove_player(player)
+        if to_team != FREE_AGENT:
+            self.teams[to_team].add_player(player)
+        index.move(player_id, to_team)
+        if self.journal is not None:
+            # Signings carry the player, since the journal's snapshot doesn't have the free agents
+            self.journal.record_roster_move(player_id, from_team, to_team,
+                                            player if from_team == FREE_AGENT else None)
+        if self.reporter.enabled:
+            self.reporter.emit("roster_move", player=player.name, position=player.position,
+                               from_team=self.teams[from_team].name if from_team != FREE_AGENT else "Free Agency",
+                               to_team=self.teams[to_team].name if to_team != FREE_AGENT else "Free Agency")
+
+
+def lineup_strength(team):
+    """Average overall of a team's starting lineup, counting empty slots at REPLACEMENT_LEVEL."""
+    total = 0
+    for position, slots in TeamRatings.LINEUP.items():
+        starters = team.ratings.starters(position)
+        total += sum(player.get_overall_rating() for player in starters) + REPLACEMENT_LEVEL * (slots - len(starters))
+    return total / sum(TeamRatings.LINEUP.values())
+
+
+def undrafted_players(draft):
+    """Builds Player objects for every prospect a draft left on the board, best first."""
+    return [draft.pool.make_player(row) for row in draft.board.ranked()]
+
+
+# Example Usage: a market cycle for a drafted 32-team league with the leftover prospects as free agents
+if __name__ == "__main__":
+    from players_and_draft import Draft
+    from rng_streams import RngStream
+
+    master = RngStream(seed=3)
+    draft = Draft(num_draft_players=32 * 30, num_teams=32, verbose=False, rng=master.child("draft"), rounds=25)
+    draft.run_draft()
+    market = TradeMarket(draft.teams, rng=master.child("market"), free_agents=undrafted_players(draft))
+    before = sum(lineup_strength(team) for team in draft.teams) / len(draft.teams)
+    summary = market.run_cycle()
+    after = sum(lineup_strength(team) for team in draft.teams) / len(draft.teams)
+
+    print(f"{summary['days']} market days for {len(draft.teams)} teams in {summary['seconds']:.3f}s: "
+          f"{summary['candidates']} candidate trades scored, {summary['trades']} trades, "
+          f"{summary['signings']} free agents signed")
+    print(f"Average lineup strength {before:.2f} -> {after:.2f}")
+    best_left = market.index.query(team=FREE_AGENT, limit=3)
+    print("Best free agents left:", ", ".join(f"{market.index.players[p].name} ({market.index.players[p].position}, "
+                                              f"{market.index.overall(p)})" for p in best_left))
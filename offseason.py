@@ -0,0 +1,198 @@
+# offseason.py
+import random
+import time
+from array import array
+
+from constants import ATTRIBUTE_MIN, ATTRIBUTE_MAX
+from draft_ai import NeedBasedStrategy
+from events import SILENT
+from instrumentation import timed
+from players_and_draft import Draft, PlayerPool
+
+# Development curve
+PEAK_AGE = 27           # Players grow toward their potential up to this age
+DECLINE_AGE = 30        # and start losing ground from this one
+GROWTH_RATE = 0.35      # Most of the gap to potential a player can close in one offseason
+DECLINE_PER_YEAR = 1.5  # Most attribute points lost per year past DECLINE_AGE
+SPEED_DECLINE_FACTOR = 1.5 # Speed fades faster than strength and skill
+
+# Retirement
+RETIREMENT_AGE = 38     # Nobody plays past this age
+RETIREMENT_BASE_CHANCE = 0.02
+RETIREMENT_CHANCE_PER_YEAR = 0.08 # Added for each year past DECLINE_AGE
+
+# New draft class
+PROSPECTS_PER_PICK = 2  # Draft class size relative to the number of picks
+MIN_DRAFT_ROUNDS = 1
+
+ATTRIBUTES = ("speed", "strength", "skill")
+STAGES = ("gather", "aging", "progression", "regression", "retirement", "scatter", "draft")
+
+
+class OffseasonEngine:
+    """
+    Moves a league from one season to the next: aging, progression toward potential,
+    regression for veterans, retirement and a new draft class.
+    Every stage works on whole columns (one typed array per attribute, gathered from all
+    rostered players at once) rather than player by player, and the time each stage took
+    is kept per season for timing_report().
+    """
+
+    def __init__(self, rng=None, reporter=SILENT):
+        self.rng = rng if rng is not None else random # An RngStream gets a child stream per season
+        self.reporter = reporter
+        self.stage_times = [] # One {"season": n, stage: seconds, ...} per offseason run
+
+    def _season_rng(self, season):
+        child = getattr(self.rng, "child", None)
+        return child("offseason", season) if child is not None else self.rng
+
+    @timed("offseason.run")
+    def run(self, teams, season, first_id=None, draft_order=None, run_draft=True):
+        """
+        Runs the offseason that leads into season. Returns the new Draft, already run when
+        run_draft is True (otherwise left for the game's draft phase).
+        draft_order lists the teams in picking order, e.g. worst record first.
+        first_id is the first player_id for the new class (defaults past every rostered id).
+        """
+        rng = self._season_rng(season)
+        timings = {"season": season}
+        start = time.perf_counter()
+
+        # Gather every rostered player into columns
+        players = [player for team in teams for player in team.roster]
+        columns = PlayerPool.from_players(players)
+        count = len(players)
+        start = _lap(timings, "gather", start)
+
+        ages = array('B', [min(age + 1, 255) for age in columns.age])
+        start = _lap(timings, "aging", start)
+
+        # Progression: players up to PEAK_AGE close a random share of the gap to their potential
+        growth = [GROWTH_RATE * u if age <= PEAK_AGE else 0.0 for age, u in zip(ages, rng.uniforms(count))]
+        for attribute in ATTRIBUTES:
+            values = getattr(columns, attribute)
+            setattr(columns, attribute, array('B', [
+                value + int(max(potential - value, 0) * rate + 0.5)
+                for value, potential, rate in zip(values, columns.potential, growth)
+            ]))
+        start = _lap(timings, "progression", start)
+
+        # Regression: veterans lose up to DECLINE_PER_YEAR per year past DECLINE_AGE, speed fastest
+        decline = [(age - DECLINE_AGE + 1) * DECLINE_PER_YEAR if age >= DECLINE_AGE else 0.0 for age in ages]
+        for attribute in ATTRIBUTES:
+            factor = SPEED_DECLINE_FACTOR if attribute == "speed" else 1.0
+            values = getattr(columns, attribute)
+            setattr(columns, attribute, array('B', [
+                min(max(value - int(loss * factor * u + 0.5), ATTRIBUTE_MIN), ATTRIBUTE_MAX)
+                for value, loss, u in zip(values, decline, rng.uniforms(count))
+            ]))
+        start = _lap(timings, "regression", start)
+
+        retiring = bytearray(
+            age >= RETIREMENT_AGE or u < RETIREMENT_BASE_CHANCE + max(age - DECLINE_AGE, 0) * RETIREMENT_CHANCE_PER_YEAR
+            for age, u in zip(ages, rng.uniforms(count))
+        )
+        retired = sum(retiring)
+        start = _lap(timings, "retirement", start)
+
+        # Write the columns back and drop the retirees from their rosters
+        for player, age, speed, strength, skill in zip(players, ages, columns.speed, columns.strength, columns.skill):
+            player.age = age
+            player.speed = speed
+            player.strength = strength
+            player.skill = skill
+        if retired:
+            row = 0
+            for team in teams:
+                roster = team.roster
+                keep = []
+                for player in roster:
+                    if retiring[row]:
+                        player.team = None
+                    else:
+                        keep.append(player)
+                    row += 1
+                team.roster = keep
+        for team in teams:
+            team.refresh_ratings() # Every player's attributes moved
+        start = _lap(timings, "scatter", start)
+
+        # New draft class, sized so the league replaces its retirees on average
+        if first_id is None:
+            first_id = max((p.player_id for p in players if p.player_id is not None), default=-1) + 1
+        rounds = max(MIN_DRAFT_ROUNDS, round(retired / len(teams))) if teams else MIN_DRAFT_ROUNDS
+        prospects = rounds * len(teams) * PROSPECTS_PER_PICK
+        draft_rng = rng.child("draft") if hasattr(rng, "child") else rng
+        draft = Draft(num_draft_players=prospects, num_teams=len(teams), rng=draft_rng, first_id=first_id,
+                      reporter=self.reporter, rounds=rounds)
+        draft.teams = list(draft_order or teams)
+        if self.reporter.enabled:
+            self.reporter.emit("offseason_end", season=season, retired=retired, prospects=prospects)
+        if run_draft:
+            draft.run_draft(strategy=NeedBasedStrategy()) # Teams fill the holes retirement left
+        _lap(timings, "draft", start)
+
+        self.stage_times.append(timings)
+        return draft
+
+    def timing_report(self):
+        """Per-season stage timings in milliseconds as a text table, with a total row."""
+        header = f"| {'Season':>6} | " + " | ".join(f"{stage:>11}" for stage in STAGES) + f" | {'Total':>8} |"
+        lines = [header, "-" * len(header)]
+        totals = dict.fromkeys(STAGES, 0.0)
+        for timings in self.stage_times:
+            cells = []
+            for stage in STAGES:
+                totals[stage] += timings.get(stage, 0.0)
+                cells.append(f"{timings.get(stage, 0.0) * 1000:>11.2f}")
+            total = sum(timings.get(stage, 0.0) for stage in STAGES)
+            lines.append(f"| {timings['season']:>6} | " + " | ".join(cells) + f" | {total * 1000:>8.2f} |")
+        lines.append("-" * len(header))
+        lines.append(f"| {'All':>6} | " + " | ".join(f"{totals[stage] * 1000:>11.2f}" for stage in STAGES)
+                     + f" | {sum(totals.values()) * 1000:>8.2f} |")
+        return "\n".join(lines)
+
+    def print_timing_report(self):
+        print("\n--- Offseason Stage Timings (ms) ---")
+        print(self.timing_report())
+
+
+def _lap(timings, stage, start):
+    """Records the time since start under stage and returns the new start."""
+    now = time.perf_counter()
+    timings[stage] = now - start
+    return now
+
+
+# Example Usage: a 100-season dynasty for a 32-team league, simulated without output
+if __name__ == "__main__":
+    from rng_streams import RngStream
+    from simulation import SeasonSimulator
+
+    NUM_TEAMS, SEASONS = 32, 100
+    master = RngStream(seed=42)
+    opening = Draft(num_draft_players=NUM_TEAMS * 25, num_teams=NUM_TEAMS, verbose=False, rng=master.child("draft"))
+    opening.run_draft(strategy=NeedBasedStrategy())
+    teams = opening.teams
+    offseason = OffseasonEngine(rng=master)
+    next_id = NUM_TEAMS * 25
+
+    start = time.perf_counter()
+    season_seconds = 0.0
+    for season in range(1, SEASONS + 1):
+        season_start = time.perf_counter()
+        simulator = SeasonSimulator(teams, weeks=17, engine="batch", verbose=False, rng=master.child("season", season))
+        simulator.run_season()
+        season_seconds += time.perf_counter() - season_start
+        worst_first = simulator.ranked_teams()[::-1]
+        draft = offseason.run(teams, season + 1, first_id=next_id, draft_order=worst_first)
+        next_id += len(draft.pool)
+    elapsed = time.perf_counter() - start
+
+    ages = [p.age for team in teams for p in team.roster]
+    print(f"{SEASONS} seasons of a {NUM_TEAMS}-team league in {elapsed:.2f}s "
+          f"({season_seconds:.2f}s playing seasons, {elapsed - season_seconds:.2f}s in offseasons)")
+    print(f"League now has {len(ages)} players, mean age {sum(ages) / len(ages):.1f}")
+    offseason.stage_times = offseason.stage_times[-5:] # Keep the report short
+    offseason.print_timing_report()
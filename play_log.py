@@ -0,0 +1,238 @@
+# play_log.py
+import json
+import mmap
+import os
+from array import array
+from collections import Counter, namedtuple
+
+try:
+    import numpy # Optional: column views come back as NumPy arrays when it is installed
+except ImportError:
+    numpy = None
+
+# Play types stored in the play_type column
+PLAY_TYPES = ("run", "pass", "incomplete", "sack", "punt", "field_goal", "interception", "fumble")
+PLAY_CODES = {name: code for code, name in enumerate(PLAY_TYPES)}
+NO_PLAYER = -1 # Player columns for plays without that player (e.g. no passer on a run)
+
+# One fixed-width column file per field. yard_line is measured from the offense's own goal line.
+PLAY_COLUMNS = (
+    ("game", 'I'), ("drive", 'B'), ("offense", 'B'), # offense: 0 home, 1 away
+    ("down", 'B'), ("distance", 'B'), ("yard_line", 'B'), ("play_type", 'B'),
+    ("passer", 'i'), ("player", 'i'), ("defender", 'i'), ("yards", 'b'), ("points", 'B'),
+)
+GAME_COLUMNS = (
+    ("first_play", 'Q'), ("plays", 'I'), ("season", 'H'), ("week", 'H'),
+    ("home", 'H'), ("away", 'H'), ("home_score", 'H'), ("away_score", 'H'),
+)
+TEAMS_FILE = "teams.json"
+
+Play = namedtuple("Play", [name for name, _ in PLAY_COLUMNS])
+
+
+def new_play_columns():
+    """Empty in-memory columns for one game's plays, in the play log's layout."""
+    return {name: array(typecode) for name, typecode in PLAY_COLUMNS}
+
+
+def _column_path(directory, table, name):
+    return os.path.join(directory, f"{table}.{name}.col")
+
+
+class PlayLog:
+    """
+    Append-only play-by-play store. Every field lives in its own file of fixed-width
+    values, so a season of plays is written with one sequential append per column and
+    read back as typed views without building Python objects.
+    A game's plays are appended first and its row in the game index last; rows past the
+    end of the index (from a write that was interrupted) are trimmed on the next open.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.teams = self._load_teams()
+        self._team_index = {name: i for i, name in enumerate(self.teams)}
+        self.num_games, self.num_plays = self._recover()
+        self._files = {}
+        for table, columns in (("plays", PLAY_COLUMNS), ("games", GAME_COLUMNS)):
+            for name, _ in columns:
+                self._files[table, name] = open(_column_path(directory, table, name), 'ab')
+
+    def _load_teams(self):
+        try:
+            with open(os.path.join(self.directory, TEAMS_FILE), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def _recover(self):
+        """Trims every column to the last complete game. Returns (games, plays)."""
+        games = min(_stored_length(self.directory, "games", name, typecode) for name, typecode in GAME_COLUMNS)
+        plays = 0
+        if games:
+            first = array('Q')
+            count = array('I')
+            with open(_column_path(self.directory, "games", "first_play"), 'rb') as f:
+                f.seek((games - 1) * first.itemsize)
+                first.fromfile(f, 1)
+            with open(_column_path(self.directory, "games", "plays"), 'rb') as f:
+                f.seek((games - 1) * count.itemsize)
+                count.fromfile(f, 1)
+            plays = first[0] + count[0]
+        for table, columns, rows in (("games", GAME_COLUMNS, games), ("plays", PLAY_COLUMNS, plays)):
+            for name, typecode in columns:
+                path = _column_path(self.directory, table, name)
+                size = rows * array(typecode).itemsize
+                if os.path.exists(path) and os.path.getsize(path) != size:
+                    os.truncate(path, size)
+        return games, plays
+
+    def _team_id(self, team):
+        team_id = self._team_index.get(team.name)
+        if team_id is None:
+            team_id = self._team_index[team.name] = len(self.teams)
+            self.teams.append(team.name)
+            path = os.path.join(self.directory, TEAMS_FILE)
+            with open(path + ".tmp", 'w') as f:
+                json.dump(self.teams, f)
+            os.replace(path + ".tmp", path)
+        return team_id
+
+    def next_game_id(self):
+        return self.num_games
+
+    def append_game(self, game, plays, season=0, week=0):
+        """Appends a finished Gameplay's plays (columns from new_play_columns) and its index row."""
+        count = len(plays["down"])
+        for name, _ in PLAY_COLUMNS:
+            plays[name].tofile(self._files["plays", name])
+        row = {
+            "first_play": self.num_plays, "plays": count, "season": season, "week": week,
+            "home": self._team_id(game.home_team), "away": self._team_id(game.away_team),
+            "home_score": game.score[game.home_team.name], "away_score": game.score[game.away_team.name],
+        }
+        for name, _ in PLAY_COLUMNS:
+            self._files["plays", name].flush()
+        for name, typecode in GAME_COLUMNS:
+            f = self._files["games", name]
+            array(typecode, [row[name]]).tofile(f)
+            f.flush()
+        self.num_games += 1
+        self.num_plays += count
+        return self.num_games - 1
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+def _stored_length(directory, table, name, typecode):
+    path = _column_path(directory, table, name)
+    return os.path.getsize(path) // array(typecode).itemsize if os.path.exists(path) else 0
+
+
+class PlayLogReader:
+    """
+    Memory-mapped, read-only view of a play log. Columns are exposed as typed memoryviews
+    (NumPy arrays when NumPy is installed) over the mapped files, so queries scan the
+    history without loading it; replay() only builds Play tuples for the game asked for.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, TEAMS_FILE), 'r') as f:
+            self.teams = json.load(f)
+        self._maps = []
+        self.games = self._map_table("games", GAME_COLUMNS)
+        self.num_games = min((len(column) for column in self.games.values()), default=0)
+        last = self.num_games - 1
+        self.num_plays = self.games["first_play"][last] + self.games["plays"][last] if self.num_games else 0
+        self.plays = self._map_table("plays", PLAY_COLUMNS)
+
+    def _map_table(self, table, columns):
+        views = {}
+        for name, typecode in columns:
+            path = _column_path(self.directory, table, name)
+            if not os.path.exists(path) or os.path.getsize(path) == 0:
+                views[name] = memoryview(array(typecode)) # mmap can't map an empty file
+                continue
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps.append(mapped)
+            views[name] = memoryview(mapped).cast(typecode)
+        return views
+
+    def __len__(self):
+        return self.num_games
+
+    def column(self, name):
+        """The whole history of one play column, NumPy-backed if available."""
+        view = self.plays[name][:self.num_plays]
+        return numpy.frombuffer(view, dtype=view.format) if numpy is not None else view
+
+    def game(self, game_id):
+        """The index row of a game, with team names resolved."""
+        row = {name: self.games[name][game_id] for name, _ in GAME_COLUMNS}
+        row["home"] = self.teams[row["home"]]
+        row["away"] = self.teams[row["away"]]
+        return row
+
+    def play_rows(self, game_id):
+        first = self.games["first_play"][game_id]
+        return range(first, first + self.games["plays"][game_id])
+
+    def replay(self, game_id):
+        """Yields a game's plays in order as Play tuples."""
+        columns = [self.plays[name] for name, _ in PLAY_COLUMNS]
+        for row in self.play_rows(game_id):
+            yield Play(*(column[row] for column in columns))
+
+    def find_games(self, team=None, season=None):
+        """Game ids involving team (by name) and/or in season."""
+        team_id = self.teams.index(team) if team is not None else None
+        home, away, seasons = self.games["home"], self.games["away"], self.games["season"]
+        return [g for g in range(self.num_games)
+                if (team_id is None or home[g] == team_id or away[g] == team_id)
+                and (season is None or seasons[g] == season)]
+
+    def yards_by_player(self, play_type=None):
+        """Total yards per player id across the whole history, optionally for one play type."""
+        totals = Counter()
+        players = self.plays["player"][:self.num_plays]
+        yards = self.plays["yards"][:self.num_plays]
+        if play_type is None:
+            for player, gained in zip(players, yards):
+                if player != NO_PLAYER:
+                    totals[player] += gained
+        else:
+            code = PLAY_CODES[play_type]
+            for player, gained, kind in zip(players, yards, self.plays["play_type"][:self.num_plays]):
+                if kind == code and player != NO_PLAYER:
+                    totals[player] += gained
+        return totals
+
+    def close(self):
+        for view in (*self.games.values(), *self.plays.values()):
+            view.release()
+        for mapped in self._maps:
+            try:
+                mapped.close()
+            except BufferError:
+                pass # A column view handed out by column() is still alive; the map closes with it
+        self._maps.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
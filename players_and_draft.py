@@ -1,10 +1,56 @@
+import heapq
 import random
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+from functools import lru_cache
+from statistics import NormalDist
+
+from constants import (ATTRIBUTE_MAX, ATTRIBUTE_MIN, DEFENSIVE_POSITIONS, OFFENSIVE_LINE_POSITIONS,
+                       OFFENSIVE_POSITIONS, POSITION_CODES)
+from data_loaders import registry
+from events import default_reporter
+from instrumentation import timed
+
+# Attributes drawn from a position's prospect profile, and the profile used when neither
+# the league file nor its "default" entry gives one: (mean, spread) of a normal clipped to
+# ATTRIBUTE_MIN..ATTRIBUTE_MAX, roughly matching the old flat 50-95 draw
+PROSPECT_ATTRIBUTES = ("speed", "strength", "skill", "potential")
+DEFAULT_PROSPECT_PROFILE = {"speed": (72, 13), "strength": (72, 13), "skill": (72, 13), "potential": (80, 11)}
+PROFILE_TABLE_SIZE = 4096 # Quantiles per sampling table
+
+
+def prospect_profiles():
+    """Returns {position: {attribute: (mean, spread)}} for every position, from the league file."""
+    profiles = registry.prospect_profiles()
+    default = dict(DEFAULT_PROSPECT_PROFILE, **profiles.get("default", {}))
+    return {position: {attribute: tuple(spec)
+                       for attribute, spec in dict(default, **profiles.get(position, {})).items()}
+            for position in POSITION_CODES}
+
+
+@lru_cache(maxsize=None)
+def _attribute_table(mean, spread):
+    """
+    Sampling table for one (mean, spread): PROFILE_TABLE_SIZE equally likely ratings at
+    evenly spaced quantiles of the normal distribution, clipped to ATTRIBUTE_MIN..ATTRIBUTE_MAX.
+    Drawing uniformly from it approximates drawing from the normal and clipping, while
+    rng.choices takes its unweighted fast path.
+    """
+    if spread <= 0:
+        return (min(max(round(mean), ATTRIBUTE_MIN), ATTRIBUTE_MAX),)
+    inv_cdf = NormalDist(mean, spread).inv_cdf
+    return tuple(min(max(round(inv_cdf((i + 0.5) / PROFILE_TABLE_SIZE)), ATTRIBUTE_MIN), ATTRIBUTE_MAX)
+                 for i in range(PROFILE_TABLE_SIZE))
+
 
 # --- Player Class ---
 class Player:
     """Represents a single football player with various attributes."""
 
-    def __init__(self, name, position, speed, strength, skill, age=22, potential=80):
+    __slots__ = ("name", "position", "speed", "strength", "skill", "age", "potential", "team", "player_id")
+
+    def __init__(self, name, position, speed, strength, skill, age=22, potential=80, player_id=None):
         self.name = name
         self.position = position # e.g., "QB", "RB", "WR", "DE", "LB"
         self.speed = speed       # Rating 1-99
@@ -13,6 +59,15 @@ class Player:
         self.age = age           # Player's age, can impact potential and decline
         self.potential = potential # Hidden potential rating 1-99, affects development
         self.team = None         # Team the player is drafted by
+        self.player_id = player_id # Stable league-wide id (the draft pool row it came from)
+
+    def __setstate__(self, state):
+        """Restores slot state, including the plain __dict__ pickled before Player had __slots__."""
+        if isinstance(state, tuple): # (instance dict, slot dict) as produced for slotted classes
+            state = {**(state[0] or {}), **state[1]}
+        self.player_id = None
+        for attribute, value in state.items():
+            setattr(self, attribute, value)
 
     def __str__(self):
         """String representation of the player."""
@@ -30,6 +85,105 @@ class Player:
             return int((self.strength + self.strength + self.skill) / 3)
 
 
+# --- Team Ratings Class ---
+class TeamRatings:
+    """
+    Team strength kept current as players join and leave, so game engines read it in O(1)
+    instead of re-rating the whole roster before every game.
+    Unit ratings (offense, defense, offensive line, overall) are averages of player overall
+    ratings held as running sums. The depth chart keeps each position's players best first,
+    and the top ones at each position fill the starting lineup.
+    Ratings are taken when a player is added, so call Team.refresh_ratings() after changing
+    attributes of players already on the roster.
+    Adding or removing a player updates the sums in O(1) and finds the depth chart slot with a
+    binary search; the list insert or delete shifts the rest of that position, a handful of players.
+    """
+
+    LINEUP = Counter(OFFENSIVE_POSITIONS + DEFENSIVE_POSITIONS) # Starters per position
+    UNITS = ("offense", "defense", "line", "overall")
+    _OFFENSE = frozenset(OFFENSIVE_POSITIONS)
+    _DEFENSE = frozenset(DEFENSIVE_POSITIONS)
+    _LINE = frozenset(OFFENSIVE_LINE_POSITIONS)
+
+    def __init__(self, players=()):
+        self._sums = dict.fromkeys(self.UNITS, 0)
+        self._counts = dict.fromkeys(self.UNITS, 0)
+        self._depth = {}   # position -> sorted [(-overall, sequence)]
+        self._players = {} # sequence -> player
+        self._entries = {} # id(player) -> (overall, sequence)
+        self._sequence = 0 # Insertion order, breaks depth chart ties
+        for player in players:
+            self.add(player)
+
+    def _units(self, position):
+        if position in self._OFFENSE:
+            yield "offense"
+            if position in self._LINE:
+                yield "line"
+        if position in self._DEFENSE:
+            yield "defense"
+        yield "overall"
+
+    def add(self, player):
+        overall = player.get_overall_rating()
+        sequence = self._sequence
+        self._sequence += 1
+        for unit in self._units(player.position):
+            self._sums[unit] += overall
+            self._counts[unit] += 1
+        insort(self._depth.setdefault(player.position, []), (-overall, sequence))
+        self._players[sequence] = player
+        self._entries[id(player)] = (overall, sequence)
+
+    def remove(self, player):
+        overall, sequence = self._entries.pop(id(player))
+        for unit in self._units(player.position):
+            self._sums[unit] -= overall
+            self._counts[unit] -= 1
+        depth = self._depth[player.position]
+        del depth[bisect_left(depth, (-overall, sequence))]
+        del self._players[sequence]
+
+    def unit(self, name):
+        """Average overall rating of a unit; empty units fall back to the team, then ATTRIBUTE_MIN."""
+        count = self._counts[name]
+        if count:
+            return self._sums[name] / count
+        everyone = self._counts["overall"]
+        return self._sums["overall"] / everyone if everyone else ATTRIBUTE_MIN
+
+    @property
+    def offense(self):
+        return self.unit("offense")
+
+    @property
+    def defense(self):
+        return self.unit("defense")
+
+    @property
+    def line(self):
+        return self.unit("line")
+
+    @property
+    def overall(self):
+        return self.unit("overall")
+
+    @property
+    def vector(self):
+        """(offense, defense), what the game engines rate a matchup on."""
+        return self.unit("offense"), self.unit("defense")
+
+    def depth_chart(self, position):
+        """Players at a position, best overall first."""
+        return [self._players[sequence] for _, sequence in self._depth.get(position, [])]
+
+    def starters(self, position=None):
+        """The starters at one position, or a {position: starters} lineup for every position."""
+        if position is not None:
+            return self.depth_chart(position)[:self.LINEUP.get(position, 0)]
+        return {position: self.starters(position) for position in self.LINEUP}
+
+
 # --- Team Class ---
 class Team:
     """Represents a football team."""
@@ -38,6 +192,13 @@ class Team:
         self.name = name
         self.abbreviation = abbreviation # e.g., "PHI", "DAL"
         self.roster = []
+        self.ratings = TeamRatings() # Kept in step with the roster by add_player/remove_player
+
+    def __setstate__(self, state):
+        """Restores a pickled team, rebuilding ratings for teams pickled before they existed."""
+        self.__dict__.update(state)
+        if "ratings" not in state:
+            self.refresh_ratings()
 
     def __str__(self):
         return f"{self.name} ({self.abbreviation})"
@@ -46,6 +207,192 @@ class Team:
         """Adds a player to the team's roster."""
         self.roster.append(player)
         player.team = self # Assign the team to the player
+        self.ratings.add(player)
+
+    def remove_player(self, player):
+        """
+        Takes a player off the roster (e.g. a trade or release). Returns False if they weren't on it.
+        Finding the player is a scan of the roster, so this is O(roster size); rosters are small and
+        other code (the offseason, saves) relies on the roster staying a plain list in signing order.
+        """
+        for i, member in enumerate(self.roster):
+            if member is player:
+                del self.roster[i]
+                player.team = None
+                self.ratings.remove(player)
+                return True
+        return False
+
+    def refresh_ratings(self):
+        """Re-rates the whole roster, e.g. after player development changed attributes."""
+        self.ratings = TeamRatings(self.roster)
+
+
+# --- Player Pool Class ---
+class PlayerPool:
+    """
+    Column-oriented store of draft prospects. Each attribute lives in its own typed array,
+    overall ratings are computed for the whole pool at once and cached, and a Player
+    object is only built when a prospect is actually drafted.
+    """
+
+    _OFFENSIVE_LINE_CODES = frozenset(POSITION_CODES.index(p) for p in OFFENSIVE_LINE_POSITIONS)
+
+    def __init__(self, first_id=0):
+        self.first_id = first_id           # player_id of row 0, keeps ids unique across draft classes
+        self.name_index = array('I')       # Number shown in "Player 001"
+        self.position_code = array('B')    # Index into constants.POSITION_CODES
+        self.speed = array('B')
+        self.strength = array('B')
+        self.skill = array('B')
+        self.age = array('B')
+        self.potential = array('B')
+        self.names = None                  # Explicit names, only for pools rebuilt from Player objects
+        self._overall = None
+
+    @classmethod
+    def generate(cls, count, positions, rng=random, first_id=0, profiles=None):
+        """
+        Samples count prospects column by column. Positions are drawn first; each attribute
+        is then drawn in one call per position from that position's profile (see
+        prospect_profiles), so every prospect of a position shares one sampling table.
+        """
+        profiles = profiles if profiles is not None else prospect_profiles()
+        pool = cls(first_id)
+        pool.name_index = array('I', range(first_id + 1, first_id + count + 1))
+        codes = [POSITION_CODES.index(p) for p in positions] # Duplicates in positions act as weights
+        pool.position_code = array('B', rng.choices(codes, k=count))
+
+        # Rows grouped by position (an argsort of the codes) and the inverse permutation,
+        # which puts values drawn group by group back into row order
+        order = sorted(range(count), key=pool.position_code.__getitem__)
+        inverse = sorted(range(count), key=order.__getitem__)
+        groups = sorted(Counter(pool.position_code).items())
+        for attribute in PROSPECT_ATTRIBUTES:
+            values = []
+            for code, size in groups:
+                table = _attribute_table(*profiles[POSITION_CODES[code]][attribute])
+                values.extend(rng.choices(table, k=size))
+            setattr(pool, attribute, array('B', map(values.__getitem__, inverse)))
+        pool.age = array('B', rng.choices(range(21, 25), k=count))
+        return pool
+
+    @classmethod
+    def concat(cls, pools, first_id=None):
+        """Joins pools generated for consecutive id ranges into one, in the order given."""
+        pools = list(pools)
+        pool = cls(first_id if first_id is not None else (pools[0].first_id if pools else 0))
+        for column in ("name_index", "position_code", "speed", "strength", "skill", "age", "potential"):
+            merged = getattr(pool, column)
+            for part in pools:
+                merged.extend(getattr(part, column))
+        return pool
+
+    @classmethod
+    def from_players(cls, players, first_id=0):
+        """Packs existing Player objects into a pool, e.g. a draft class from an old save."""
+        pool = cls(first_id)
+        pool.name_index = array('I', range(first_id + 1, first_id + len(players) + 1))
+        pool.position_code = array('B', [POSITION_CODES.index(p.position) for p in players])
+        for column in ("speed", "strength", "skill", "age", "potential"):
+            setattr(pool, column, array('B', [getattr(p, column) for p in players]))
+        pool.names = [p.name for p in players]
+        return pool
+
+    def __len__(self):
+        return len(self.position_code)
+
+    @property
+    def overall(self):
+        """Overall rating of every prospect, matching Player.get_overall_rating. Computed once."""
+        if self._overall is None:
+            line = self._OFFENSIVE_LINE_CODES
+            self._overall = array('B', [
+                (strength + strength + skill) // 3 if code in line else (speed + strength + skill) // 3
+                for code, speed, strength, skill
+                in zip(self.position_code, self.speed, self.strength, self.skill)
+            ])
+        return self._overall
+
+    def ranked(self):
+        """Returns pool rows ordered by overall rating, best first (ties keep generation order)."""
+        # An argsort of the overall column: only row numbers are sorted, no rows are built
+        return sorted(range(len(self)), key=self.overall.__getitem__, reverse=True)
+
+    def name(self, row):
+        if self.names is not None:
+            return self.names[row]
+        return f"Player {self.name_index[row]:03d}"
+
+    def position(self, row):
+        return POSITION_CODES[self.position_code[row]]
+
+    def make_player(self, row):
+        """Builds the Player object for a pool row, e.g. once the prospect is drafted."""
+        return Player(self.name(row), self.position(row), self.speed[row], self.strength[row],
+                      self.skill[row], self.age[row], self.potential[row], player_id=self.first_id + row)
+
+
+# --- Draft Board Class ---
+class DraftBoard:
+    """
+    Ranks the undrafted rows of a PlayerPool. Keeps one max-heap over the whole pool and
+    one per position; drafted rows are only marked as taken and are dropped from a heap
+    when they reach its top, so picks and best-available queries cost O(log n) amortized.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self._taken = bytearray(len(pool))
+        self._remaining = len(pool)
+
+        overall = pool.overall
+        self._heap = [(-overall[row], row) for row in range(len(pool))] # Ties fall back to generation order
+        self._by_position = {}
+        for entry in self._heap:
+            self._by_position.setdefault(pool.position_code[entry[1]], []).append(entry)
+        heapq.heapify(self._heap)
+        for heap in self._by_position.values():
+            heapq.heapify(heap)
+
+    def __len__(self):
+        return self._remaining
+
+    def is_available(self, row):
+        return isinstance(row, int) and 0 <= row < len(self._taken) and not self._taken[row]
+
+    def take(self, row):
+        """Marks a pool row as drafted. Returns False if it was already taken or does not exist."""
+        if not self.is_available(row):
+            return False
+        self._taken[row] = 1
+        self._remaining -= 1
+        return True
+
+    def best_available(self, position=None):
+        """Returns the highest rated undrafted row, optionally only at one position, or None."""
+        if position is None:
+            heap = self._heap
+        elif position in POSITION_CODES:
+            heap = self._by_position.get(POSITION_CODES.index(position))
+            if heap is None:
+                return None
+        else:
+            print(f"Unknown position: {position}")
+            return None
+        taken = self._taken
+        while heap and taken[heap[0][1]]:
+            heapq.heappop(heap) # Lazy deletion of rows drafted since they were pushed
+        return heap[0][1] if heap else None
+
+    def ranked(self, position=None):
+        """Lists every undrafted row best first. O(n log n); meant for display, not the pick loop."""
+        if position is not None and position not in POSITION_CODES:
+            print(f"Unknown position: {position}")
+            return []
+        heap = self._heap if position is None else self._by_position.get(POSITION_CODES.index(position), [])
+        taken = self._taken
+        return [row for _, row in sorted(heap) if not taken[row]]
 
 
 # --- Draft Class ---
@@ -56,93 +403,127 @@ class Draft:
     DEFENSIVE_POSITIONS = ["DE", "DE", "DT", "DT", "LB", "LB", "CB", "CB", "S", "S"]
     ALL_POSITIONS = OFFENSIVE_POSITIONS + DEFENSIVE_POSITIONS
 
-    def __init__(self, num_draft_players=20, num_teams=2):
+    def __init__(self, num_draft_players=20, num_teams=2, verbose=True, pool=None, rng=None, first_id=0,
+                 reporter=None, rounds=None, workers=1):
         self.num_draft_players = num_draft_players
-        self.available_players = self._generate_players(num_draft_players)
+        self.rounds = rounds # Picks per team; None splits the whole pool between the teams
+        # Where picks are reported; verbose=False is shorthand for silence
+        self.reporter = reporter if reporter is not None else default_reporter(verbose)
+        self.rng = rng if rng is not None else random # e.g. an RngStream for a reproducible draft class
+        self.first_id = first_id # player_id of the first prospect, so draft classes don't reuse ids
+        self.workers = workers # Processes for generating very large classes; None uses every core
+        # An existing pool (e.g. from a save file) skips generating a new draft class
+        self.pool = pool if pool is not None else self._generate_players(num_draft_players)
+        self.board = DraftBoard(self.pool) # Tracks which pool rows are still undrafted
         self.drafted_players = []
         self.teams = self._generate_teams(num_teams)
         self.current_pick = 0 # Tracks which player is next to be picked
 
+    @timed("draft.generate_players")
     def _generate_players(self, count):
-        """Generates a list of random players for the draft pool."""
-        players = []
-        for i in range(count):
-            name = f"Player {i+1:03d}" # e.g., Player 001
-            position = random.choice(self.ALL_POSITIONS)
-            speed = random.randint(50, 95)
-            strength = random.randint(50, 95)
-            skill = random.randint(50, 95)
-            age = random.randint(21, 24)
-            potential = random.randint(60, 99)
-            players.append(Player(name, position, speed, strength, skill, age, potential))
-        return sorted(players, key=lambda p: p.get_overall_rating(), reverse=True) # Sorted by overall rating
+        """Generates the columnar pool of random prospects for the draft."""
+        from draft_class import generate_draft_class # Imported here; draft_class builds on this module
+        # Names run Player 001, Player 002, ... counting on from first_id. Very large classes
+        # are only split across worker processes when workers asks for it.
+        return generate_draft_class(count, self.ALL_POSITIONS, rng=self.rng, first_id=self.first_id,
+                                    workers=self.workers)
 
     def _generate_teams(self, count):
-        """Generates a list of teams."""
-        team_names = ["Hawks", "Sharks", "Lions", "Dragons", "Vipers", "Bears", "Wolves", "Panthers"]
-        team_abbrs = ["HAW", "SHK", "LIO", "DRA", "VIP", "BER", "WOL", "PAN"]
-        
-        teams = []
-        for i in range(count):
-            name = team_names[i % len(team_names)]
-            abbr = team_abbrs[i % len(team_abbrs)]
-            teams.append(Team(name, abbr))
-        return teams
+        """Generates a list of teams from the league data file."""
+        return [Team(name, abbr) for name, abbr in registry.league_teams(count)]
+
+    @property
+    def available_players(self):
+        """Pool rows still undrafted, best overall first."""
+        return self.board.ranked()
 
     def display_available_players(self):
         """Prints the list of players currently available in the draft."""
         print("\n--- Available Players for Draft ---")
-        if not self.available_players:
+        if not self.board:
             print("No players left in the draft pool.")
             return
 
+        # Idx is the pool row, which is what draft_player expects
         print(f"| {'Idx':<3} | {'Name':<10} | {'Pos':<4} | {'Spd':<3} | {'Str':<3} | {'Skl':<3} | {'Ovr':<3} |")
         print("-" * 50)
-        for i, player in enumerate(self.available_players):
-            print(f"| {i:<3} | {player.name:<10} | {player.position:<4} | {player.speed:<3} | {player.strength:<3} | {player.skill:<3} | {player.get_overall_rating():<3} |")
+        pool = self.pool
+        for row in self.available_players:
+            print(f"| {row:<3} | {pool.name(row):<10} | {pool.position(row):<4} | {pool.speed[row]:<3} | {pool.strength[row]:<3} | {pool.skill[row]:<3} | {pool.overall[row]:<3} |")
 
+    @timed("draft.pick")
     def draft_player(self, team, player_index):
-        """Drafts a player by a given team."""
-        if not self.available_players:
+        """
+        Drafts a player by a given team.
+        player_index is the pool row shown as Idx (it used to be a position in the list of undrafted
+        players, which shifted after every pick). Rows that are taken, out of range or not an int
+        are rejected with a message and False.
+        """
+        if not self.board:
             print("Draft pool is empty. No more players to draft.")
             return False
 
-        if 0 <= player_index < len(self.available_players):
-            player = self.available_players.pop(player_index)
+        if self.board.take(player_index):
+            player = self.pool.make_player(player_index)
             team.add_player(player)
             self.drafted_players.append(player)
             self.current_pick += 1
-            print(f"--- {player.name} ({player.position}) drafted by {team.name} ({team.abbreviation})! ---")
+            if self.reporter.enabled:
+                self.reporter.emit("draft_pick", pick=self.current_pick, player=player.name,
+                                   player_id=player.player_id, position=player.position,
+                                   team=team.name, abbreviation=team.abbreviation)
             return True
         else:
             print("Invalid player index. Please choose an available player.")
             return False
 
-    def run_draft(self):
-        """Automates a simple draft process for multiple teams."""
-        print("\n--- Starting Draft ---")
+    @timed("draft.run")
+    def run_draft(self, strategy=None, rounds=None, on_pick=None):
+        """
+        Automates a simple draft process for multiple teams.
+        strategy is a draft_ai.DraftStrategy; None takes the best available player every pick.
+        rounds limits the picks per team (defaults to the draft's rounds, else splitting the whole pool).
+        on_pick(team, row) is called after every successful pick, e.g. to journal it.
+        A draft that already has picks (e.g. one loaded mid-draft) carries on from current_pick.
+        """
+        reporter = self.reporter
+        if reporter.enabled:
+            reporter.emit("draft_start", teams=len(self.teams), prospects=len(self.board))
         num_teams = len(self.teams)
-        picks_per_team = self.num_draft_players // num_teams
+        rounds = self.rounds if rounds is None else rounds
+        picks_per_team = self.num_draft_players // num_teams if rounds is None else rounds
+        if strategy is not None:
+            strategy.start_draft(self)
 
         # Simple round-robin draft order
-        for i in range(picks_per_team):
-            for team_index in range(num_teams):
-                if not self.available_players:
-                    print("\nDraft concluded - no more players available.")
-                    return
-
-                current_team = self.teams[team_index]
-                
-                # For simplicity, teams pick the highest overall player available
-                # A more complex AI could be implemented here
-                if self.available_players:
-                    self.draft_player(current_team, 0) # Always pick the first player (highest rated)
-                    # Optional: Display current rosters after each pick
-                    # print(f"\n{current_team.name} Roster Size: {len(current_team.roster)}")
-                    # for p in current_team.roster:
-                    #     print(f"  - {p}")
-                    # self.display_available_players() # To see the pool shrink
+        for pick in range(self.current_pick, picks_per_team * num_teams):
+            if not self.board:
+                if reporter.enabled:
+                    reporter.emit("draft_exhausted", picks=self.current_pick)
+                    reporter.emit("draft_end", picks=self.current_pick)
+                return
+
+            current_team = self.teams[pick % num_teams]
+
+            if strategy is None:
+                # Without a strategy, teams pick the highest overall player available
+                row = self.board.best_available()
+                picked = self.draft_player(current_team, row)
+            else:
+                row = strategy.choose_pick(self, current_team)
+                picked = self.draft_player(current_team, row)
+                if picked:
+                    strategy.record_pick(current_team, self.pool.position(row))
+            if picked and on_pick is not None:
+                on_pick(current_team, row)
+            # Optional: Display current rosters after each pick
+            # print(f"\n{current_team.name} Roster Size: {len(current_team.roster)}")
+            # for p in current_team.roster:
+            #     print(f"  - {p}")
+            # self.display_available_players() # To see the pool shrink
 
+        if reporter.enabled:
+            reporter.emit("draft_end", picks=self.current_pick)
 
 # Example Usage (for testing purposes, you'd typically run this from a main game file)
 if __name__ == "__main__":
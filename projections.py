@@ -0,0 +1,131 @@
+# projections.py
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from batch_engine import BatchGameEngine
+from rng_streams import RngStream
+from simulation import SeasonSimulator
+
+DEFAULT_CHUNK_SIZE = 250 # Seasons per task handed to a worker
+
+# Per-process state, filled once by _init_worker so teams are only unpickled once per worker
+_worker_season = None
+_worker_games = None
+
+
+class SeasonProjection:
+    """Aggregated results of many simulated seasons for one league."""
+
+    def __init__(self, teams, weeks, win_histograms, finish_counts, num_seasons):
+        self.teams = teams
+        self.weeks = weeks
+        self.win_histograms = win_histograms # [team index][wins] -> seasons
+        self.finish_counts = finish_counts   # [team index][finish position] -> seasons
+        self.num_seasons = num_seasons
+
+    def mean_wins(self, team_index):
+        """Average number of wins for a team across all projected seasons."""
+        histogram = self.win_histograms[team_index]
+        return sum(wins * seasons for wins, seasons in enumerate(histogram)) / self.num_seasons
+
+    def finish_probabilities(self, team_index):
+        """Probability of finishing in each position (index 0 is first place)."""
+        return [count / self.num_seasons for count in self.finish_counts[team_index]]
+
+    def playoff_odds(self, team_index, playoff_spots):
+        """Probability of finishing inside the top playoff_spots teams."""
+        return sum(self.finish_counts[team_index][:playoff_spots]) / self.num_seasons
+
+    def display(self, playoff_spots=2):
+        """Prints a projection table sorted by mean wins."""
+        print(f"\n--- Season Projection ({self.num_seasons} seasons, {self.weeks} weeks) ---")
+        print(f"| {'Team':<10} | {'Mean W':<6} | {'1st %':<6} | {'Playoff %':<9} |")
+        print("-" * 44)
+        order = sorted(range(len(self.teams)), key=self.mean_wins, reverse=True)
+        for i in order:
+            first = self.finish_counts[i][0] / self.num_seasons * 100
+            playoff = self.playoff_odds(i, playoff_spots) * 100
+            print(f"| {self.teams[i].name:<10} | {self.mean_wins(i):<6.2f} | {first:<6.1f} | {playoff:<9.1f} |")
+
+
+def _init_worker(teams, weeks):
+    """Builds the worker's SeasonSimulator once; every later task only sends seeds."""
+    global _worker_season, _worker_games
+    _worker_season = SeasonSimulator(teams, weeks=weeks, engine="batch", verbose=False)
+    index_of = {id(team): i for i, team in enumerate(teams)}
+    _worker_games = [[(index_of[id(home)], index_of[id(away)]) for home, away in games]
+                     for games in _worker_season.schedule]
+
+
+def _run_chunk(seed, first_season, count):
+    """Runs count quiet seasons and returns (win histograms, finish counts) for the chunk."""
+    season = _worker_season
+    engine = BatchGameEngine() # Per task, so thread workers don't share a generator
+    master = RngStream(seed)
+
+    num_teams = len(season.teams)
+    win_histograms = [[0] * (season.num_weeks + 1) for _ in range(num_teams)]
+    finish_counts = [[0] * num_teams for _ in range(num_teams)]
+
+    for season_index in range(first_season, first_season + count):
+        rng = engine.rng = master.child("season", season_index) # Same stream whichever worker runs it
+        wins = [0] * num_teams
+        for games, index_pairs in zip(season.schedule, _worker_games):
+            for (home, away), (home_score, away_score) in zip(index_pairs, engine.simulate_scores(games)):
+                wins[home if home_score > away_score else away] += 1
+
+        for i, total in enumerate(wins):
+            win_histograms[i][total] += 1
+        order = list(range(num_teams))
+        rng.shuffle(order) # Random tiebreak between teams level on wins
+        for position, i in enumerate(sorted(order, key=wins.__getitem__, reverse=True)):
+            finish_counts[i][position] += 1
+
+    return win_histograms, finish_counts
+
+
+def _chunk_plan(num_seasons, chunk_size, seed):
+    """Splits the run into (seed, first season, count) tasks. Each season has its own RNG stream."""
+    return [(seed, first, min(chunk_size, num_seasons - first))
+            for first in range(0, num_seasons, chunk_size)]
+
+
+def project_seasons(teams, num_seasons=10000, weeks=17, workers=None, seed=0,
+                    chunk_size=DEFAULT_CHUNK_SIZE, executor="process"):
+    """
+    Simulates the same league num_seasons times and aggregates the outcomes.
+    workers=None uses every core; workers=1 runs in the current process.
+    executor picks "process" or "thread" workers. Every season draws from its own
+    RngStream, so the same seed gives the same projection however the work is split.
+    """
+    plan = _chunk_plan(num_seasons, chunk_size, seed)
+    num_teams = len(teams)
+
+    if workers == 1:
+        _init_worker(teams, weeks)
+        chunk_results = [_run_chunk(*task) for task in plan]
+    else:
+        workers = workers or os.cpu_count() or 1
+        pool_class = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+        with pool_class(max_workers=workers, initializer=_init_worker, initargs=(teams, weeks)) as pool:
+            chunk_results = list(pool.map(_run_chunk, *zip(*plan)))
+
+    win_histograms = [[0] * (weeks + 1) for _ in range(num_teams)]
+    finish_counts = [[0] * num_teams for _ in range(num_teams)]
+    for chunk_wins, chunk_finishes in chunk_results:
+        for i in range(num_teams):
+            win_histograms[i] = [a + b for a, b in zip(win_histograms[i], chunk_wins[i])]
+            finish_counts[i] = [a + b for a, b in zip(finish_counts[i], chunk_finishes[i])]
+
+    return SeasonProjection(teams, weeks, win_histograms, finish_counts, num_seasons)
+
+
+# Example Usage: project a small drafted league
+if __name__ == "__main__":
+    from players_and_draft import Draft
+
+    draft = Draft(num_draft_players=80, num_teams=4)
+    draft.run_draft()
+
+    projection = project_seasons(draft.teams, num_seasons=2000, weeks=6, seed=7)
+    projection.display(playoff_spots=2)
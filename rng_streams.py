@@ -0,0 +1,71 @@
+# rng_streams.py
+import hashlib
+import random
+
+
+class RngStream(random.Random):
+    """
+    A random generator that belongs to a tree of independent streams derived from one
+    master seed. Each stream is addressed by its path of keys, e.g. ("season", 3, "week", 7),
+    and seeded from a hash of (master seed, path), so a stream gives the same numbers no
+    matter which thread or process creates it, or in what order.
+    Being a random.Random, a stream can be passed anywhere the game accepts an rng.
+    """
+
+    def __init__(self, seed=None, path=()):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.master_seed = seed
+        self.path = tuple(path)
+        self.spawned = 0 # Children handed out by spawn() so far
+        super().__init__(self._derive_seed())
+
+    def _derive_seed(self):
+        digest = hashlib.blake2b(repr((self.master_seed, self.path)).encode(), digest_size=16).digest()
+        return int.from_bytes(digest, "little")
+
+    def child(self, *key):
+        """Returns the independent stream at this stream's path plus key."""
+        return RngStream(self.master_seed, self.path + key)
+
+    def spawn(self, count):
+        """Returns count new child streams, continuing from earlier spawns (like SeedSequence.spawn)."""
+        children = [self.child("spawn", self.spawned + i) for i in range(count)]
+        self.spawned += count
+        return children
+
+    def randints(self, low, high, count):
+        """Draws count integers in [low, high] in one call."""
+        return self.choices(range(low, high + 1), k=count)
+
+    def uniforms(self, count):
+        """Draws count floats in [0, 1) in one call."""
+        rand = self.random
+        return [rand() for _ in range(count)]
+
+    def __reduce__(self):
+        # Pickles as its address in the tree plus how far it has been drawn
+        return (RngStream, (self.master_seed, self.path), (self.getstate(), self.spawned))
+
+    def __setstate__(self, state):
+        generator_state, self.spawned = state
+        self.setstate(generator_state)
+
+
+# Example Usage: the same seed gives the same league however the work is spread out
+if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor
+
+    master = RngStream(seed=2024)
+    seasons = [master.child("season", i) for i in range(4)]
+    serial = [season.randints(50, 95, 5) for season in seasons]
+
+    def draw(i):
+        return RngStream(seed=2024).child("season", i).randints(50, 95, 5)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        threaded = list(pool.map(draw, reversed(range(4))))[::-1]
+
+    print("Serial:  ", serial)
+    print("Threaded:", threaded)
+    print("Identical:", serial == threaded)
@@ -0,0 +1,340 @@
+# save_format.py
+import json
+import mmap
+import os
+import pickle # Only used to read saves written before the versioned format
+import struct
+from array import array
+
+from constants import POSITION_CODES
+from data_loaders import registry
+from events import CONSOLE
+from players_and_draft import Draft, DraftBoard, Player, PlayerPool, Team
+from rng_streams import RngStream
+from standings import StandingsTable
+
+# File layout: header, section table, then each section's bytes.
+# Players, the draft pool and the schedule are stored as columns of typed arrays with
+# integer foreign keys (team index, player row) instead of pickled object graphs, so
+# saves stay small, survive class changes and can be read one section at a time.
+MAGIC = b"RFSAVE"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<6sHH")       # magic, format version, section count
+SECTION_ENTRY = struct.Struct("<16sQQ") # name, offset, length
+COLUMN_ENTRY = struct.Struct("<16scQ")  # name, array typecode, byte length
+
+PLAYER_COLUMNS = ("speed", "strength", "skill", "age", "potential")
+NO_TEAM = -1   # Team index of a player without a team
+NO_PLAYER = -1 # player_id of a player who was never given one (the same as play_log.NO_PLAYER)
+
+
+class SaveFormatError(Exception):
+    """Raised when a save file is damaged or newer than this version of the game understands."""
+
+
+# --- Encoding helpers ---
+def _pack_table(columns):
+    """Packs a dict of name -> array into one section: column count, column entries, data."""
+    parts = [struct.pack("<H", len(columns))]
+    for name, values in columns.items():
+        parts.append(COLUMN_ENTRY.pack(name.encode(), values.typecode.encode(), len(values) * values.itemsize))
+    parts.extend(values.tobytes() for values in columns.values())
+    return b"".join(parts)
+
+
+def _unpack_table(view):
+    """Reverses _pack_table. Each column is copied straight out of the mapped file into an array."""
+    (count,) = struct.unpack_from("<H", view, 0)
+    offset = 2 + count * COLUMN_ENTRY.size
+    columns = {}
+    for i in range(count):
+        name, typecode, length = COLUMN_ENTRY.unpack_from(view, 2 + i * COLUMN_ENTRY.size)
+        values = array(typecode.decode())
+        values.frombytes(view[offset:offset + length])
+        columns[name.rstrip(b"\0").decode()] = values
+        offset += length
+    return columns
+
+
+def _pack_strings(strings):
+    """Packs a list of strings as (end offsets, utf-8 blob) columns."""
+    ends, blob = array('I'), bytearray()
+    for text in strings:
+        blob += text.encode()
+        ends.append(len(blob))
+    return ends, array('B', blob)
+
+
+def _unpack_strings(ends, blob):
+    data = blob.tobytes()
+    start, strings = 0, []
+    for end in ends:
+        strings.append(data[start:end].decode())
+        start = end
+    return strings
+
+
+# --- Writing ---
+def _game_sections(game):
+    """Flattens a Game into named sections of bytes."""
+    teams = game.all_teams
+    team_index = {id(team): i for i, team in enumerate(teams)}
+
+    players = [player for team in teams for player in team.roster]
+    player_row = {id(player): row for row, player in enumerate(players)}
+    ends, blob = _pack_strings([p.name for p in players])
+    player_table = {
+        "player_id": array('q', [NO_PLAYER if p.player_id is None else p.player_id for p in players]),
+        "team": array('i', [team_index.get(id(p.team), NO_TEAM) for p in players]),
+        "position": array('B', [POSITION_CODES.index(p.position) for p in players]),
+        "name_end": ends,
+        "name_blob": blob,
+    }
+    for column in PLAYER_COLUMNS:
+        player_table[column] = array('B', [getattr(p, column) for p in players])
+
+    meta = {
+        "current_state": game.current_state,
+        "current_season": game.current_season,
+        "current_week": game.current_week,
+        "user_team": team_index.get(id(game.user_team), NO_TEAM),
+        "seed": game.rng.master_seed,
+        "teams": [[team.name, team.abbreviation] for team in teams],
+        "standings": game.standings.to_rows() if game.standings is not None else None,
+        # Which autosave journal this file is the snapshot for; see SaveJournal.replay
+        "journal_generation": game.journal.generation if getattr(game, "journal", None) else None,
+    }
+    sections = {"meta": json.dumps(meta).encode(), "players": _pack_table(player_table)}
+
+    draft = game.draft
+    if draft is not None:
+        pool = draft.pool
+        pool_table = {"name_index": pool.name_index, "position": pool.position_code,
+                      "taken": array('B', [0 if draft.board.is_available(row) else 1 for row in range(len(pool))])}
+        for column in PLAYER_COLUMNS:
+            pool_table[column] = getattr(pool, column)
+        if pool.names is not None:
+            pool_table["name_end"], pool_table["name_blob"] = _pack_strings(pool.names)
+        draft_meta = {
+            "num_draft_players": draft.num_draft_players,
+            "rounds": draft.rounds,
+            "current_pick": draft.current_pick,
+            "first_id": pool.first_id,
+            "order": [team_index[id(team)] for team in draft.teams], # Picking order, e.g. worst record first
+            "drafted": [player_row[id(p)] for p in draft.drafted_players if id(p) in player_row],
+        }
+        sections["draft_meta"] = json.dumps(draft_meta).encode()
+        sections["draft_pool"] = _pack_table(pool_table)
+
+    if game.schedule:
+        week_lengths, home, away = array('I'), array('I'), array('I')
+        for week in game.schedule:
+            week_lengths.append(len(week))
+            for home_team, away_team in week:
+                home.append(team_index[id(home_team)])
+                away.append(team_index[id(away_team)])
+        sections["schedule"] = _pack_table({"week_length": week_lengths, "home": home, "away": away})
+
+    return sections
+
+
+def write_game(game, filepath):
+    """Writes a Game to filepath in the versioned format. The old file is only replaced once the new one is complete."""
+    sections = _game_sections(game) # Touches game.draft and game.schedule, so nothing deferred is left to read
+    offset = HEADER.size + SECTION_ENTRY.size * len(sections)
+    table = []
+    for name, data in sections.items():
+        table.append(SECTION_ENTRY.pack(name.encode(), offset, len(data)))
+        offset += len(data)
+
+    temp_path = filepath + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(sections)))
+        f.writelines(table)
+        f.writelines(sections.values())
+        f.flush()
+        os.fsync(f.fileno()) # The data must be on disk before the rename can point at it
+    _release_save(game) # A game loaded from filepath still maps it, and Windows can't replace a mapped file
+    os.replace(temp_path, filepath)
+    _fsync_directory(os.path.dirname(os.path.abspath(filepath))) # Makes the rename itself durable
+
+
+def _fsync_directory(path):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return # e.g. Windows, where directories can't be opened; the rename is already atomic there
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# --- Reading ---
+class SaveFile:
+    """
+    A memory-mapped save. Only the header and section table are parsed on open;
+    each section is decoded the first time it is asked for.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        with open(filepath, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.version, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise SaveFormatError(f"{filepath} is not a versioned save file")
+        if self.version > FORMAT_VERSION:
+            self.close()
+            raise SaveFormatError(f"{filepath} uses save format {self.version}; this game reads up to {FORMAT_VERSION}")
+        self.sections = {}
+        for i in range(count):
+            name, offset, length = SECTION_ENTRY.unpack_from(self._map, HEADER.size + i * SECTION_ENTRY.size)
+            self.sections[name.rstrip(b"\0").decode()] = (offset, length)
+
+    def close(self):
+        self._map.close()
+
+    def has_section(self, name):
+        return name in self.sections
+
+    def _view(self, name):
+        offset, length = self.sections[name]
+        return self._map[offset:offset + length]
+
+    def read_meta(self):
+        return json.loads(self._view("meta"))
+
+    def read_teams(self):
+        """Rebuilds every Team with its roster. Returns the list of teams and the Player objects by row."""
+        teams = [Team(name, abbr) for name, abbr in self.read_meta()["teams"]]
+        table = _unpack_table(self._view("players"))
+        names = _unpack_strings(table["name_end"], table["name_blob"])
+        players = []
+        for row, name in enumerate(names):
+            player_id = table["player_id"][row]
+            player = Player(name, POSITION_CODES[table["position"][row]],
+                            *(table[column][row] for column in PLAYER_COLUMNS),
+                            player_id=None if player_id == NO_PLAYER else player_id)
+            if table["team"][row] != NO_TEAM:
+                teams[table["team"][row]].add_player(player)
+            players.append(player)
+        return teams, players
+
+    def read_draft(self, teams, players, reporter=None):
+        """Rebuilds the Draft with its pool and board, or None if the save has no draft."""
+        if not self.has_section("draft_meta"):
+            return None
+        draft_meta = json.loads(self._view("draft_meta"))
+        table = _unpack_table(self._view("draft_pool"))
+        pool = PlayerPool(draft_meta["first_id"])
+        pool.name_index = table["name_index"]
+        pool.position_code = table["position"]
+        for column in PLAYER_COLUMNS:
+            setattr(pool, column, table[column])
+        if "name_end" in table:
+            pool.names = _unpack_strings(table["name_end"], table["name_blob"])
+
+        draft = Draft(draft_meta["num_draft_players"], len(teams), pool=pool, reporter=reporter,
+                      rounds=draft_meta.get("rounds"))
+        order = draft_meta.get("order") # Saves from before the order was kept pick in league order
+        draft.teams = [teams[i] for i in order] if order is not None else teams
+        for row, taken in enumerate(table["taken"]):
+            if taken:
+                draft.board.take(row)
+        draft.drafted_players = [players[row] for row in draft_meta["drafted"]]
+        draft.current_pick = draft_meta["current_pick"]
+        return draft
+
+    def read_schedule(self, teams):
+        """Rebuilds the list of weeks of (home_team, away_team) games."""
+        if not self.has_section("schedule"):
+            return []
+        table = _unpack_table(self._view("schedule"))
+        home, away = table["home"], table["away"]
+        schedule, start = [], 0
+        for length in table["week_length"]:
+            schedule.append([(teams[home[i]], teams[away[i]]) for i in range(start, start + length)])
+            start += length
+        return schedule
+
+
+def is_versioned_save(filepath):
+    with open(filepath, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def read_game(game, filepath):
+    """
+    Fills a fresh Game from a versioned save. Teams and rosters are read now;
+    the draft and schedule stay in the mapped file until the game first touches them.
+    """
+    save = SaveFile(filepath)
+    meta = save.read_meta()
+    game.all_teams, players = save.read_teams()
+    game.user_team = game.all_teams[meta["user_team"]] if meta["user_team"] != NO_TEAM else None
+    game.current_state = meta["current_state"]
+    game.current_season = meta["current_season"]
+    game.current_week = meta["current_week"]
+    game.rng = RngStream(meta.get("seed"))
+    if meta.get("standings"):
+        game.standings = StandingsTable(game.all_teams, registry.alignment(len(game.all_teams)))
+        game.standings.load_rows(meta["standings"])
+    game.__dict__["_save_file"] = save
+    pending = {"draft", "schedule"}
+
+    def deferred(name, read):
+        def load():
+            value = read()
+            pending.discard(name)
+            if not pending:
+                _release_save(game) # Both sections are in memory; the mapping isn't needed any more
+            return value
+        return load
+
+    game.defer_load(
+        draft=deferred("draft", lambda: save.read_draft(game.all_teams, players, game.reporter)),
+        schedule=deferred("schedule", lambda: save.read_schedule(game.all_teams)),
+    )
+    return game
+
+
+def _release_save(game):
+    """Reads anything still deferred from the save a game was loaded from, then closes its mapping."""
+    save = game.__dict__.pop("_save_file", None)
+    if save is None:
+        return
+    deferred = game.__dict__.get("_deferred", {})
+    for name in ("draft", "schedule"):
+        if name in deferred:
+            if name in game.__dict__:
+                del deferred[name] # Replaced before it was ever read
+            else:
+                getattr(game, name)
+    save.close()
+
+
+def read_legacy_pickle(filepath):
+    """Loads a save written by the old pickle-based Game.save_game."""
+    with open(filepath, 'rb') as f:
+        legacy = pickle.load(f)
+    draft = legacy.__dict__.get("draft")
+    if draft is not None and "pool" not in draft.__dict__:
+        # Old drafts kept undrafted prospects as a sorted list of Player objects
+        remaining = draft.__dict__.pop("available_players", [])
+        draft.pool = PlayerPool.from_players(remaining)
+        draft.board = DraftBoard(draft.pool)
+        draft.reporter = CONSOLE
+    if draft is not None:
+        draft.__dict__.setdefault("rounds", None) # Added after the pickle format
+    return legacy
+
+
+def migrate_pickle_save(filepath):
+    """Rewrites an old pickle save in place using the versioned format. Returns the loaded Game."""
+    game = read_legacy_pickle(filepath)
+    write_game(game, filepath)
+    return game
@@ -0,0 +1,145 @@
+# save_journal.py
+import json
+import os
+
+import save_format
+from events import SILENT
+from players_and_draft import Player
+
+DEFAULT_COMPACT_EVERY = 4 # Weeks of journal to keep before folding them into a new snapshot
+
+
+class SaveJournal:
+    """
+    Autosave as a snapshot plus an append-only journal of what changed since.
+    Changes are buffered in memory and written by commit() with a single fsync,
+    and every few commits the journal is compacted into a fresh snapshot.
+    Records are JSON lines:
+        {"type": "generation", "generation": n}  (first line; the snapshot records the same n)
+        {"type": "pick", "team": team index, "row": draft pool row}
+        {"type": "week", "season": n, "week": n, "results": [[home, away, home_score, away_score], ...]}
+        {"type": "roster_move", "player_id": id, "from": team index or -1, "to": team index or -1,
+         "player": [name, position, speed, strength, skill, age, potential]}  (only for signings from outside the league)
+        {"type": "state", "state": game state}
+    """
+
+    def __init__(self, snapshot_path, compact_every=DEFAULT_COMPACT_EVERY):
+        self.snapshot_path = snapshot_path
+        self.journal_path = snapshot_path + ".journal"
+        self.compact_every = compact_every
+        self.commits_since_snapshot = 0
+        self.generation = 0 # Bumped by every snapshot; pairs the journal with the snapshot it extends
+        self._pending = []
+
+    # --- Recording ---
+    def record_pick(self, team_index, row):
+        self._pending.append({"type": "pick", "team": team_index, "row": row})
+
+    def record_week(self, season, week, results=()):
+        self._pending.append({"type": "week", "season": season, "week": week,
+                              "results": [list(result) for result in results]})
+
+    def record_roster_move(self, player_id, from_team, to_team, player=None):
+        """player is the Player joining from outside the league (from_team -1), which replay has to rebuild."""
+        record = {"type": "roster_move", "player_id": player_id, "from": from_team, "to": to_team}
+        if player is not None:
+            record["player"] = [player.name, player.position, *(getattr(player, column) for column in save_format.PLAYER_COLUMNS)]
+        self._pending.append(record)
+
+    def record_state(self, state):
+        self._pending.append({"type": "state", "state": state})
+
+    # --- Writing ---
+    def start(self, game):
+        """Writes a fresh snapshot for game and empties the journal."""
+        self.generation += 1
+        save_format.write_game(game, self.snapshot_path) # Durable before the old journal goes
+        self._reset_journal()
+        self._pending.clear()
+        self.commits_since_snapshot = 0
+
+    def commit(self, game):
+        """Appends every buffered record with one write and one fsync, compacting when due."""
+        if not self._pending:
+            return
+        lines = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in self._pending)
+        with open(self.journal_path, 'a') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self._pending.clear()
+
+        self.commits_since_snapshot += 1
+        if self.commits_since_snapshot >= self.compact_every:
+            self.start(game)
+
+    def _reset_journal(self):
+        with open(self.journal_path, 'w') as f:
+            f.write(json.dumps({"type": "generation", "generation": self.generation}, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    # --- Reading ---
+    def read_records(self):
+        """Yields journal records in order. A torn last line from an interrupted write is ignored."""
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, 'r') as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                yield json.loads(line)
+
+    def replay(self, game):
+        """
+        Applies the journal to a game freshly loaded from the snapshot. A journal from an
+        older generation than the snapshot (a crash after a compaction's snapshot was written
+        but before the journal was emptied) is already in the snapshot, so it is skipped
+        and emptied instead of being applied twice.
+        """
+        snapshot = save_format.SaveFile(self.snapshot_path)
+        try:
+            snapshot_generation = snapshot.read_meta().get("journal_generation")
+        finally:
+            snapshot.close()
+        self.generation = snapshot_generation or 0
+        teams = game.all_teams
+        for record in self.read_records():
+            kind = record["type"]
+            if kind == "generation":
+                if snapshot_generation is not None and record["generation"] != snapshot_generation:
+                    self._reset_journal()
+                    return
+            elif kind == "pick":
+                reporter, game.draft.reporter = game.draft.reporter, SILENT
+                game.draft.draft_player(teams[record["team"]], record["row"])
+                game.draft.reporter = reporter
+            elif kind == "week":
+                game.current_season = record["season"]
+                game.current_week = record["week"]
+                for home, away, home_score, away_score in record["results"]:
+                    game.standings.record_result(home, away, home_score, away_score)
+            elif kind == "roster_move":
+                _move_player(teams, record)
+            elif kind == "state":
+                game.current_state = record["state"]
+                if game.current_state == "SEASON" and game.standings is None:
+                    game.start_season() # The snapshot predates the season's schedule
+
+
+def _move_player(teams, record):
+    player_id, from_team, to_team = record["player_id"], record["from"], record["to"]
+    if from_team == save_format.NO_TEAM:
+        if "player" not in record:
+            print(f"Warning: autosave journal can't rebuild signed player {player_id}; the signing is lost.")
+            return
+        if to_team != save_format.NO_TEAM:
+            name, position, *attributes = record["player"]
+            teams[to_team].add_player(Player(name, position, *attributes, player_id=player_id))
+        return
+    for player in teams[from_team].roster:
+        if player.player_id == player_id:
+            teams[from_team].remove_player(player)
+            if to_team != save_format.NO_TEAM:
+                teams[to_team].add_player(player)
+            return
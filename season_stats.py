@@ -0,0 +1,327 @@
+# season_stats.py
+import heapq
+from array import array
+from collections import deque
+
+from play_log import NO_PLAYER, PLAY_CODES
+
+# Player stats, one array per stat per scope, indexed by the player's slot in that scope
+PLAYER_STATS = ("pass_yards", "rush_yards", "receiving_yards", "touchdowns", "tackles", "sacks", "interceptions",
+                "forced_fumbles")
+# Team stats, indexed by the team's position in the league
+TEAM_STATS = ("wins", "losses", "points_for", "points_against", "yards", "turnovers")
+SCOPES = ("week", "season", "career")
+
+DEFAULT_TOP_K = 10
+DEFAULT_HISTORY = 20      # Finished seasons whose leaderboards are kept
+
+_RUN, _PASS, _SACK = PLAY_CODES["run"], PLAY_CODES["pass"], PLAY_CODES["sack"]
+_INTERCEPTION, _FUMBLE = PLAY_CODES["interception"], PLAY_CODES["fumble"]
+
+
+class StatColumns:
+    """
+    One scope's player totals: a typed array per stat, indexed by a dense slot per player.
+    A player gets a slot with their first stat in the scope and gives it back when the scope
+    drops them, and freed slots are reused before the arrays grow, so the arrays are only as
+    long as the most players the scope has held at once.
+    """
+
+    def __init__(self):
+        self.slots = {} # player_id -> slot
+        self.values = {stat: array('i') for stat in PLAYER_STATS}
+        self._free = [] # Slots given back, reused first
+
+    def __len__(self):
+        return len(self.slots)
+
+    def slot(self, player_id):
+        """The player's slot, handing out a zeroed one if they don't have one yet."""
+        slot = self.slots.get(player_id)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+            else:
+                slot = len(self.values[PLAYER_STATS[0]])
+                for column in self.values.values():
+                    column.append(0)
+            self.slots[player_id] = slot
+        return slot
+
+    def get(self, player_id, stat):
+        """The player's total, or None if the scope doesn't hold them."""
+        slot = self.slots.get(player_id)
+        return self.values[stat][slot] if slot is not None else None
+
+    def release(self, player_id):
+        slot = self.slots.pop(player_id)
+        for column in self.values.values():
+            column[slot] = 0
+        self._free.append(slot)
+
+    def clear(self):
+        """Drops every player. Only their slots are zeroed, so this is O(players held)."""
+        for slot in self.slots.values():
+            for column in self.values.values():
+                column[slot] = 0
+        self.slots.clear()
+        self._free = list(range(len(self.values[PLAYER_STATS[0]]) - 1, -1, -1)) # Lowest slots first
+
+
+class Leaderboard:
+    """
+    Top players for one stat, maintained as results stream in. Every change pushes a
+    (-value, player_id) entry onto a heap and superseded entries are skipped when read
+    (the same lazy deletion the DraftBoard uses), so updates cost O(log n) and reading
+    the top k only touches the front of the heap.
+    """
+
+    def __init__(self, columns, stat):
+        self.columns = columns # The StatColumns the entries are checked against
+        self.stat = stat
+        self._heap = []
+
+    def update(self, player_id):
+        heapq.heappush(self._heap, (-self.columns.get(player_id, self.stat), player_id))
+        if len(self._heap) > 4 * len(self.columns) + 64:
+            self._compact()
+
+    def _compact(self):
+        """Drops superseded entries once the heap has grown well past one entry per player."""
+        columns, stat = self.columns, self.stat
+        latest = {player_id: value for value, player_id in self._heap if -value == columns.get(player_id, stat)}
+        self._heap = [(value, player_id) for player_id, value in latest.items()]
+        heapq.heapify(self._heap)
+
+    def top(self, k):
+        """The k best (player_id, value) pairs, best first."""
+        heap, columns, stat = self._heap, self.columns, self.stat
+        leaders, seen, kept = [], set(), []
+        while heap and len(leaders) < k:
+            entry = heapq.heappop(heap)
+            value, player_id = entry
+            if -value != columns.get(player_id, stat) or player_id in seen:
+                continue # Superseded by a later update, dropped from the scope, or already taken
+            seen.add(player_id)
+            leaders.append((player_id, -value))
+            kept.append(entry)
+        for entry in kept:
+            heapq.heappush(heap, entry)
+        return leaders
+
+    def clear(self):
+        self._heap.clear()
+
+
+class SeasonStats:
+    """
+    Streaming player and team statistics with week -> season -> career rollups.
+    Games are fed in as they finish; player stats come from a Gameplay's play-by-play
+    columns and team stats from the final score, so batch-engine results count too.
+    Each scope keeps player totals in StatColumns, typed arrays indexed by dense slots
+    that are recycled as players leave it. A finished week is folded into the season and
+    the season into the career totals, each walking only the players it touched. The last
+    week's totals stay readable (leaders(scope="week")) until the next week's first game. Career
+    totals are kept for active players and for retired players still on a career
+    leaderboard; retire() drops everyone else, so over a long dynasty the career arrays
+    track the league's current rosters rather than every player who ever played.
+    Only the leaderboards of the last `history` seasons are kept.
+    """
+
+    def __init__(self, teams, top_k=DEFAULT_TOP_K, history=DEFAULT_HISTORY):
+        self.teams = teams
+        self._team_index = {id(team): i for i, team in enumerate(teams)}
+        self.top_k = top_k
+        self.players = {scope: StatColumns() for scope in SCOPES}
+        self.team_totals = {scope: {stat: array('i', [0] * len(teams)) for stat in TEAM_STATS} for scope in SCOPES}
+        self.leaderboards = {scope: {stat: Leaderboard(self.players[scope], stat) for stat in PLAYER_STATS}
+                             for scope in ("season", "career")}
+        self.history = deque(maxlen=history) # {"season": n, "leaders": {...}, "teams": [...]} per finished season
+        self._retired_leaders = set() # Retired players kept in the career scope for their leaderboard places
+        self._week_folded = False # The week scope holds a finished week, cleared when the next one starts
+
+    # --- Recording ---
+    def record_game(self, game):
+        """Adds one finished game (a Gameplay or a batch GameResult) to the week's totals."""
+        if self._week_folded:
+            self._start_week()
+        home, away = self._team_index[id(game.home_team)], self._team_index[id(game.away_team)]
+        home_score, away_score = game.score[game.home_team.name], game.score[game.away_team.name]
+        week_teams = self.team_totals["week"]
+        week_teams["points_for"][home] += home_score
+        week_teams["points_against"][home] += away_score
+        week_teams["points_for"][away] += away_score
+        week_teams["points_against"][away] += home_score
+        if home_score != away_score:
+            winner, loser = (home, away) if home_score > away_score else (away, home)
+            week_teams["wins"][winner] += 1
+            week_teams["losses"][loser] += 1
+
+        plays = getattr(game, "plays", None)
+        if plays is not None:
+            self._record_plays(plays, (home, away))
+
+    def _record_plays(self, plays, sides):
+        """Aggregates a game's play columns into per-player deltas, then applies them."""
+        deltas = {}
+
+        def add(stat, player_id, amount=1):
+            if player_id != NO_PLAYER:
+                key = (stat, player_id)
+                deltas[key] = deltas.get(key, 0) + amount
+
+        week_teams = self.team_totals["week"]
+        for kind, offense, passer, player, defender, yards, points in zip(
+                plays["play_type"], plays["offense"], plays["passer"], plays["player"],
+                plays["defender"], plays["yards"], plays["points"]):
+            if kind == _RUN:
+                add("rush_yards", player, yards)
+            elif kind == _PASS:
+                add("pass_yards", passer, yards)
+                add("receiving_yards", player, yards)
+            elif kind == _SACK:
+                add("pass_yards", passer, yards)
+                add("sacks", defender)
+            elif kind in (_INTERCEPTION, _FUMBLE):
+                add("interceptions" if kind == _INTERCEPTION else "forced_fumbles", defender)
+                week_teams["turnovers"][sides[offense]] += 1
+            if kind in (_RUN, _PASS, _SACK):
+                week_teams["yards"][sides[offense]] += yards
+                if points:
+                    add("touchdowns", player)
+                else:
+                    add("tackles", defender)
+
+        week = self.players["week"]
+        for (stat, player_id), amount in deltas.items():
+            week.values[stat][week.slot(player_id)] += amount
+
+    # --- Rollups ---
+    def end_week(self):
+        """Folds the week into the season totals. The week stays readable until the next game is recorded."""
+        if self._week_folded:
+            return
+        _fold_players(self.players["week"], self.players["season"], self.leaderboards["season"], clear=False)
+        _fold_teams(self.team_totals["week"], self.team_totals["season"], clear=False)
+        self._week_folded = True
+
+    def _start_week(self):
+        self.players["week"].clear()
+        for values in self.team_totals["week"].values():
+            for i in range(len(values)):
+                values[i] = 0
+        self._week_folded = False
+
+    def end_season(self, season):
+        """Folds the season into the career totals, keeps its leaderboards and starts a new one."""
+        self.end_week() # In case the season's last week wasn't closed
+        summary = {
+            "season": season,
+            "leaders": {stat: self.leaders(stat, scope="season") for stat in PLAYER_STATS},
+            "teams": self.team_table(scope="season"),
+        }
+        self.history.append(summary)
+
+        _fold_players(self.players["season"], self.players["career"], self.leaderboards["career"])
+        for board in self.leaderboards["season"].values():
+            board.clear()
+        _fold_teams(self.team_totals["season"], self.team_totals["career"])
+        self._release_retired()
+        return summary
+
+    def retire(self, player_ids):
+        """
+        Drops players who left the league from the career totals. Those on a career
+        leaderboard are kept until they fall off it.
+        """
+        career = self.players["career"]
+        self._retired_leaders.update(player_id for player_id in player_ids if player_id in career.slots)
+        self._release_retired()
+
+    def career_players(self):
+        """Ids of every player with career totals, e.g. to find who has left the league."""
+        return list(self.players["career"].slots)
+
+    def _release_retired(self):
+        if not self._retired_leaders:
+            return
+        leaders = {player_id for board in self.leaderboards["career"].values() for player_id, _ in board.top(self.top_k)}
+        for player_id in self._retired_leaders - leaders:
+            self.players["career"].release(player_id)
+        self._retired_leaders &= leaders
+
+    # --- Queries ---
+    def player_stat(self, player_id, stat, scope="season"):
+        value = self.players[scope].get(player_id, stat)
+        return value if value is not None else 0
+
+    def leaders(self, stat, k=None, scope="season"):
+        """Top k (player_id, value) pairs for a stat in a scope, best first."""
+        k = k or self.top_k
+        if scope == "week":
+            week = self.players["week"]
+            values = week.values[stat]
+            return heapq.nlargest(k, ((player_id, values[slot]) for player_id, slot in week.slots.items()
+                                      if values[slot]), key=lambda pair: pair[1])
+        return self.leaderboards[scope][stat].top(k)
+
+    def team_table(self, scope="season"):
+        """Team totals for a scope, one dict per team in league order."""
+        totals = self.team_totals[scope]
+        return [{"team": team.name, **{stat: totals[stat][i] for stat in TEAM_STATS}}
+                for i, team in enumerate(self.teams)]
+
+    def display_leaders(self, scope="season", k=5, names=None):
+        """Prints the top k for every player stat. names maps player_id to a display name."""
+        print(f"\n--- {scope.title()} Leaders ---")
+        for stat in PLAYER_STATS:
+            leaders = self.leaders(stat, k, scope)
+            shown = ", ".join(f"{(names or {}).get(player_id, f'#{player_id}')} {value}" for player_id, value in leaders)
+            print(f"{stat.replace('_', ' ').title():<16}: {shown}")
+
+
+def _fold_players(source, target, boards, clear=True):
+    """Adds every player's totals in source to target and updates target's leaderboards."""
+    for player_id, slot in source.slots.items():
+        target_slot = None
+        for stat in PLAYER_STATS:
+            amount = source.values[stat][slot]
+            if amount:
+                if target_slot is None:
+                    target_slot = target.slot(player_id)
+                target.values[stat][target_slot] += amount
+                boards[stat].update(player_id)
+    if clear:
+        source.clear()
+
+
+def _fold_teams(source, target, clear=True):
+    for stat, values in source.items():
+        totals = target[stat]
+        for i, value in enumerate(values):
+            if value:
+                totals[i] += value
+                if clear:
+                    values[i] = 0
+
+
+# Example Usage: stream a few play-by-play seasons through the stats engine
+if __name__ == "__main__":
+    from players_and_draft import Draft
+    from rng_streams import RngStream
+    from simulation import SeasonSimulator
+
+    draft = Draft(num_draft_players=176, num_teams=8, verbose=False, rng=RngStream(11))
+    draft.run_draft()
+    names = {player.player_id: player.name for team in draft.teams for player in team.roster}
+    stats = SeasonStats(draft.teams)
+
+    for season in range(1, 4):
+        simulator = SeasonSimulator(draft.teams, weeks=17, engine="gameplay", verbose=False,
+                                    rng=RngStream(season), season=season, stats=stats)
+        simulator.run_season()
+
+    last = stats.history[-1]
+    print(f"Season {last['season']} rushing leader: "
+          f"{names[last['leaders']['rush_yards'][0][0]]} ({last['leaders']['rush_yards'][0][1]} yards)")
+    stats.display_leaders(scope="career", names=names)
@@ -1,89 +1,177 @@
 # simulation.py
+import itertools
 import random
-from gameplay import Gameplay
+
+from batch_engine import BatchGameEngine
+from events import default_reporter
+from instrumentation import PROFILER, timed, timer
+from rng_streams import RngStream
+from standings import StandingsTable
+
+
+def round_robin_weeks(num_teams, rounds=1):
+    """
+    Yields the weeks of a circle-method round-robin as lists of (home, away) team indices.
+    Each round has every team play every other team once; odd leagues give one team a bye
+    per week. Home and away swap on every other round so a double round-robin is balanced.
+    rounds=None repeats rounds forever. Each week costs O(num_teams).
+    """
+    if num_teams < 2:
+        return
+    slots = num_teams + num_teams % 2 # Odd leagues get a phantom slot that means "bye"
+    rotating = slots - 1              # Slot 0 stays fixed, the rest rotate one step per week
+    half = slots // 2
+
+    round_number = 0
+    while rounds is None or round_number < rounds:
+        for week in range(rotating):
+            games = []
+            for i in range(half):
+                # Slot k > 0 holds team 1 + (k - 1 + week) % rotating; slot i meets slot slots-1-i
+                a = 0 if i == 0 else 1 + (i - 1 + week) % rotating
+                b = 1 + (slots - 2 - i + week) % rotating
+                if a >= num_teams or b >= num_teams:
+                    continue # Bye week for whoever drew the phantom slot
+                # The fixed team alternates home and away; the others keep their side within a round
+                flip = i == 0 and week % 2 == 1
+                if flip != (round_number % 2 == 1):
+                    a, b = b, a
+                games.append((a, b))
+            yield games
+        round_number += 1
+
 
 class SeasonSimulator:
     """
     Simulates a full season of games, including a schedule and standings.
     """
-    def __init__(self, teams, weeks=17):
+    ENGINES = ("gameplay", "batch")
+
+    def __init__(self, teams, weeks=17, engine="gameplay", verbose=True, rng=None, reporter=None,
+                 schedule=None, standings=None, play_log=None, season=0, stats=None):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine '{engine}'. Choose from {self.ENGINES}.")
         self.teams = teams
         self.num_weeks = weeks
-        self.schedule = self._generate_schedule()
-        self.standings = {team.name: {"wins": 0, "losses": 0} for team in teams}
+        self.engine = engine # "gameplay" runs one Gameplay per game, "batch" simulates a whole week at once
+        # Where game results and standings go; verbose=False is shorthand for silence
+        self.reporter = reporter if reporter is not None else default_reporter(verbose)
+        self.rng = rng # An RngStream gives every week and game its own reproducible generator
+        self.batch_engine = BatchGameEngine(rng) if engine == "batch" else None
+        self.play_log = play_log # PlayLog that keeps the gameplay engine's play-by-play
+        self.season = season     # Season number written with each logged game
+        self.stats = stats       # SeasonStats fed every result, if any
+        self.schedule = schedule or self._generate_schedule() # A saved season passes its own schedule
+        self.team_by_name = {team.name: team for team in teams}
+        self.standings = standings if standings is not None else StandingsTable(teams)
 
+    @timed("schedule.generate")
     def _generate_schedule(self):
-        """Generates a simple, round-robin style schedule."""
-        schedule = []
-        team_names = [team.name for team in self.teams]
-        num_teams = len(team_names)
-        
-        # For simplicity, a basic non-repeating schedule for a small league
-        # A more realistic schedule is much more complex
-        
-        if num_teams % 2 != 0:
-            team_names.append("BYE") # Add a dummy team for odd number of teams
-
-        for week in range(self.num_weeks):
-            week_games = []
-            temp_teams = team_names[:]
-            
-            # Simple rotation method for scheduling
-            home_teams = temp_teams[:num_teams//2]
-            away_teams = temp_teams[num_teams//2:]
-            
-            for i in range(len(home_teams)):
-                if home_teams[i] != "BYE" and away_teams[i] != "BYE":
-                    home_team_obj = next(t for t in self.teams if t.name == home_teams[i])
-                    away_team_obj = next(t for t in self.teams if t.name == away_teams[i])
-                    week_games.append((home_team_obj, away_team_obj))
-            
-            schedule.append(week_games)
-            
-            # Rotate the teams for the next week's matchups
-            if num_teams > 2:
-                first = temp_teams.pop(1)
-                temp_teams.append(first)
-                team_names = temp_teams
-        
-        return schedule
+        """Builds the season's weeks from the circle-method round-robin, repeating rounds as needed."""
+        return list(itertools.islice(self.iter_schedule(), self.num_weeks))
+
+    def iter_schedule(self, rounds=None):
+        """
+        Lazily yields each week as a list of (home_team, away_team) games.
+        rounds=None keeps cycling round-robins; rounds=2 is a double round-robin.
+        """
+        teams = self.teams
+        for week in round_robin_weeks(len(teams), rounds):
+            yield [(teams[home], teams[away]) for home, away in week]
 
+    def reset_standings(self):
+        """Clears every team's record so the same schedule can be replayed."""
+        self.standings.reset()
+
+    @timed("season.run")
     def run_season(self):
         """Runs the simulation for an entire season."""
-        print(f"\n--- Starting Season {self.num_weeks} Weeks ---")
-        for week, games in enumerate(self.schedule):
-            print(f"\n-- Simulating Week {week + 1} --")
-            for home_team, away_team in games:
-                print(f"Simulating game: {away_team.name} vs. {home_team.name}")
-                game = Gameplay(home_team, away_team)
+        if self.reporter.enabled:
+            self.reporter.emit("season_start", weeks=self.num_weeks)
+        for week in range(len(self.schedule)):
+            self.play_week(week)
+        self.end_season()
+
+    def play_week(self, week):
+        """Plays week (0-based) of the schedule, updates the standings and returns the results."""
+        reporter = self.reporter
+        if reporter.enabled:
+            reporter.emit("week_start", week=week + 1)
+        results = self.simulate_week(self.schedule[week], week)
+        for game in results:
+            self.update_standings(game)
+        if self.stats is not None:
+            for game in results:
+                self.stats.record_game(game)
+            self.stats.end_week() # The week's totals and leaders stay readable until next week's games
+        if reporter.enabled:
+            reporter.emit("week_end", week=week + 1)
+        return results
+
+    def end_season(self):
+        if self.stats is not None:
+            self.stats.end_season(self.season)
+        if self.reporter.enabled:
+            self.reporter.emit("season_end", standings=[record.as_dict() for record in self.standings.ranked()])
+
+    def game_rngs(self, week, count):
+        """Independent generators for each game of a week, or None without an RngStream."""
+        if not isinstance(self.rng, RngStream) or week is None:
+            return None
+        return self.rng.child("week", week).spawn(count)
+
+    @timed("season.week")
+    def simulate_week(self, games, week=None):
+        """Plays one week of (home_team, away_team) games with the selected engine."""
+        if self.engine == "batch":
+            results = self.batch_engine.simulate_week(games, self.game_rngs(week, len(games)))
+            PROFILER.count("season.games", len(results))
+            if self.reporter.enabled:
+                for game in results:
+                    self._report_game(game)
+            return results
+
+        from gameplay import Gameplay # Only needed by the per-game engine
+        results = []
+        rngs = self.game_rngs(week, len(games)) or [self.rng] * len(games)
+        for (home_team, away_team), rng in zip(games, rngs):
+            with timer("season.game"):
+                game = Gameplay(home_team, away_team, rng=rng, play_log=self.play_log,
+                                season=self.season, week=0 if week is None else week + 1)
                 game.start_game()
-                self.update_standings(game)
-        
-        self.display_standings()
-        print("\n--- End of Season ---")
+            if self.reporter.enabled:
+                self._report_game(game)
+            results.append(game)
+        return results
+
+    def _report_game(self, game):
+        home, away = game.home_team.name, game.away_team.name
+        self.reporter.emit("game_result", home=home, away=away,
+                           home_score=game.score[home], away_score=game.score[away])
 
     def update_standings(self, game):
-        """Updates the win/loss records based on a game's outcome."""
+        """Adds a game's outcome to the standings, which re-rank only the two teams involved."""
         home_score = game.score[game.home_team.name]
         away_score = game.score[game.away_team.name]
-        
-        if home_score > away_score:
-            self.standings[game.home_team.name]["wins"] += 1
-            self.standings[game.away_team.name]["losses"] += 1
-        elif away_score > home_score:
-            self.standings[game.away_team.name]["wins"] += 1
-            self.standings[game.home_team.name]["losses"] += 1
-        # No ties for simplicity
+        self.standings.record_game(game.home_team, game.away_team, home_score, away_score)
+
+        if home_score == away_score or not self.reporter.enabled:
+            return
+        winner, loser = ((game.home_team, game.away_team) if home_score > away_score
+                         else (game.away_team, game.home_team))
+        self.reporter.emit("standings_update", winner=winner.name, loser=loser.name,
+                           winner_wins=self.standings.record(winner).wins,
+                           loser_losses=self.standings.record(loser).losses)
+
+    def ranked_teams(self):
+        """Teams in standings order, best first."""
+        return [record.team for record in self.standings.ranked()]
 
     def display_standings(self):
         """Prints the final season standings."""
         print("\n--- Final Season Standings ---")
-        # Sort teams by wins
-        sorted_teams = sorted(self.teams, key=lambda team: self.standings[team.name]["wins"], reverse=True)
-        
-        for team in sorted_teams:
-            record = self.standings[team.name]
-            print(f"{team.name:<10}: {record['wins']} W - {record['losses']} L")
+        for record in self.standings.ranked():
+            print(f"{record.team.name:<10}: {record.wins} W - {record.losses} L")
 
 # Example Usage: (Will be called from the GameState Manager)
 if __name__ == "__main__":
@@ -94,5 +182,5 @@ if __name__ == "__main__":
     draft.run_draft()
     
     # Run the season with the drafted teams
-    season = SeasonSimulator(draft.teams, weeks=3) # Short season for demonstration
+    season = SeasonSimulator(draft.teams, weeks=3, engine="batch") # Short season for demonstration
     season.run_season()
@@ -0,0 +1,167 @@
+# standings.py
+from bisect import bisect_left, insort
+
+
+class TeamRecord:
+    """One team's season record plus where it sits in the league alignment."""
+    __slots__ = ("team", "index", "conference", "division", "wins", "losses", "ties",
+                 "points_for", "points_against", "key")
+
+    def __init__(self, team, index, conference, division):
+        self.team = team
+        self.index = index
+        self.conference = conference
+        self.division = division
+        self.wins = 0
+        self.losses = 0
+        self.ties = 0
+        self.points_for = 0
+        self.points_against = 0
+        self.key = self._rank_key()
+
+    @property
+    def games(self):
+        return self.wins + self.losses + self.ties
+
+    @property
+    def win_pct(self):
+        """Win percentage with ties counting as half a win."""
+        return (self.wins + self.ties / 2) / self.games if self.games else 0.0
+
+    @property
+    def point_diff(self):
+        return self.points_for - self.points_against
+
+    def _rank_key(self):
+        # Tiebreakers in order: win percentage, point differential, points scored, league order
+        return (-self.win_pct, -self.point_diff, -self.points_for, self.index)
+
+    def as_dict(self):
+        return {"team": self.team.name, "wins": self.wins, "losses": self.losses, "ties": self.ties,
+                "points_for": self.points_for, "points_against": self.points_against}
+
+    def __str__(self):
+        record = f"{self.wins}-{self.losses}" + (f"-{self.ties}" if self.ties else "")
+        return f"{self.team.name} ({record})"
+
+
+class StandingsTable:
+    """
+    Season standings kept in rank order as results arrive.
+    The league, each conference and each division has its own sorted list of rank keys,
+    so a result moves its two teams instead of re-sorting the table, and any of the tables
+    can be read at any point in the season. Finding a team's place is a binary search, but
+    the list delete and insert shift keys, so a move is O(teams) - a few dozen keys at most.
+    """
+
+    def __init__(self, teams, alignment=None):
+        """alignment gives each team's (conference, division); without it the league is one group."""
+        alignment = alignment or [(None, None)] * len(teams)
+        self.records = [TeamRecord(team, i, conference, division)
+                        for i, (team, (conference, division)) in enumerate(zip(teams, alignment))]
+        self._index_of = {id(team): i for i, team in enumerate(teams)}
+        self._rebuild()
+
+    def _groups(self, record):
+        return (None, ("conference", record.conference), ("division", record.conference, record.division))
+
+    def _rebuild(self):
+        """Sorts every table from scratch; only needed after bulk changes like load_rows."""
+        self._tables = {}
+        for record in self.records:
+            record.key = record._rank_key()
+            for group in self._groups(record):
+                self._tables.setdefault(group, []).append(record.key)
+        for keys in self._tables.values():
+            keys.sort()
+
+    def _update(self, record, apply):
+        """Applies a change to a record and moves it to its new place in each of its tables."""
+        old_key = record.key
+        apply(record)
+        record.key = record._rank_key()
+        for group in self._groups(record):
+            keys = self._tables[group]
+            del keys[bisect_left(keys, old_key)]
+            insort(keys, record.key)
+
+    # --- Results ---
+    def record_result(self, home, away, home_score, away_score):
+        """Adds a game between the teams at indices home and away."""
+        def apply_home(record):
+            record.points_for += home_score
+            record.points_against += away_score
+            _add_outcome(record, home_score, away_score)
+
+        def apply_away(record):
+            record.points_for += away_score
+            record.points_against += home_score
+            _add_outcome(record, away_score, home_score)
+
+        self._update(self.records[home], apply_home)
+        self._update(self.records[away], apply_away)
+
+    def record_game(self, home_team, away_team, home_score, away_score):
+        self.record_result(self._index_of[id(home_team)], self._index_of[id(away_team)], home_score, away_score)
+
+    def reset(self):
+        for record in self.records:
+            record.wins = record.losses = record.ties = 0
+            record.points_for = record.points_against = 0
+        self._rebuild()
+
+    # --- Queries ---
+    def record(self, team):
+        return self.records[self._index_of[id(team)]]
+
+    def ranked(self, conference=None, division=None):
+        """Records best first for the league, one conference, or one division of a conference."""
+        if division is not None:
+            group = ("division", conference, division)
+        elif conference is not None:
+            group = ("conference", conference)
+        else:
+            group = None
+        return [self.records[key[-1]] for key in self._tables.get(group, [])]
+
+    def rank(self, team):
+        """1-based league position of a team."""
+        record = self.record(team)
+        return bisect_left(self._tables[None], record.key) + 1
+
+    def conferences(self):
+        return sorted({record.conference for record in self.records if record.conference is not None})
+
+    def divisions(self, conference):
+        return sorted({record.division for record in self.records
+                       if record.conference == conference and record.division is not None})
+
+    # --- Saving ---
+    def to_rows(self):
+        """Records as [wins, losses, ties, points for, points against] in team order."""
+        return [[r.wins, r.losses, r.ties, r.points_for, r.points_against] for r in self.records]
+
+    def load_rows(self, rows):
+        for record, (wins, losses, ties, points_for, points_against) in zip(self.records, rows):
+            record.wins, record.losses, record.ties = wins, losses, ties
+            record.points_for, record.points_against = points_for, points_against
+        self._rebuild()
+
+    def display(self, conference=None, division=None):
+        """Prints one table of the standings, the whole league by default."""
+        title = " ".join(str(part) for part in (conference, division) if part is not None) or "League"
+        print(f"\n--- {title} Standings ---")
+        print(f"| {'Team':<12} | {'W':>3} | {'L':>3} | {'T':>3} | {'PF':>5} | {'PA':>5} |")
+        print("-" * 50)
+        for r in self.ranked(conference, division):
+            print(f"| {r.team.name:<12} | {r.wins:>3} | {r.losses:>3} | {r.ties:>3} | "
+                  f"{r.points_for:>5} | {r.points_against:>5} |")
+
+
+def _add_outcome(record, scored, allowed):
+    if scored > allowed:
+        record.wins += 1
+    elif scored < allowed:
+        record.losses += 1
+    else:
+        record.ties += 1
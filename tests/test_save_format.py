@@ -0,0 +1,143 @@
+# test_save_format.py
+import os
+import pickle
+
+import save_format
+from events import SILENT
+from game_state_manager import Game
+
+
+def new_game(save_dir, autosave=False):
+    game = Game(save_dir=str(save_dir), autosave=autosave, seed=11, reporter=SILENT, verbose=False)
+    game.start_new_game(num_draft_players=120, num_teams=4)
+    return game
+
+
+def roster_rows(game):
+    return [[(p.player_id, p.name, p.position, p.speed, p.strength, p.skill, p.age, p.potential)
+             for p in team.roster] for team in game.all_teams]
+
+
+def schedule_rows(game):
+    index = {id(team): i for i, team in enumerate(game.all_teams)}
+    return [[(index[id(home)], index[id(away)]) for home, away in week] for week in game.schedule]
+
+
+def load(filepath):
+    return save_format.read_game(Game(os.path.dirname(filepath), reporter=SILENT, verbose=False), filepath)
+
+
+def test_round_trip_mid_draft(tmp_path):
+    game = new_game(tmp_path)
+    draft = game.draft
+    for team in reversed(game.all_teams): # A picking order that differs from league order
+        draft.draft_player(team, draft.board.best_available())
+    draft.teams = list(reversed(draft.teams))
+    filepath = str(tmp_path / "mid_draft.dat")
+    save_format.write_game(game, filepath)
+
+    loaded = load(filepath)
+    assert roster_rows(loaded) == roster_rows(game)
+    assert loaded.user_team is loaded.all_teams[0]
+    assert loaded.draft.board.ranked() == draft.board.ranked()
+    assert [team.name for team in loaded.draft.teams] == [team.name for team in draft.teams]
+    assert loaded.draft.current_pick == draft.current_pick
+    assert [p.player_id for p in loaded.draft.drafted_players] == [p.player_id for p in draft.drafted_players]
+    assert loaded.schedule == []
+    assert "_save_file" not in loaded.__dict__ # Both deferred sections were read, so the mapping is closed
+
+
+def test_round_trip_in_season(tmp_path):
+    game = new_game(tmp_path)
+    game.run_draft_phase()
+    game.advance_weeks(3)
+    filepath = str(tmp_path / "season.dat")
+    save_format.write_game(game, filepath)
+
+    loaded = load(filepath)
+    assert (loaded.current_state, loaded.current_season, loaded.current_week) == ("SEASON", 1, 3)
+    assert roster_rows(loaded) == roster_rows(game)
+    assert schedule_rows(loaded) == schedule_rows(game)
+    assert loaded.standings.to_rows() == game.standings.to_rows()
+
+    save_format.write_game(loaded, filepath) # Saving over the file the game was loaded from
+    assert roster_rows(load(filepath)) == roster_rows(game)
+
+
+def test_legacy_pickle_migration(tmp_path):
+    game = new_game(tmp_path)
+    draft = game.draft
+    for _ in range(8):
+        draft.draft_player(game.user_team, draft.board.best_available())
+    remaining = [draft.pool.make_player(row) for row in draft.board.ranked()]
+    expected = [(p.name, p.position, p.get_overall_rating()) for p in remaining]
+
+    # Old saves pickled the whole Game, with the undrafted prospects as a list of Players
+    for name in ("pool", "board", "rounds", "reporter"):
+        del draft.__dict__[name]
+    draft.__dict__["available_players"] = remaining # Now a property over the board
+    game.reporter = None
+    filepath = str(tmp_path / "legacy.dat")
+    with open(filepath, 'wb') as f:
+        pickle.dump(game, f)
+
+    migrated = save_format.migrate_pickle_save(filepath)
+    assert save_format.is_versioned_save(filepath)
+    loaded = load(filepath)
+    assert roster_rows(loaded) == roster_rows(migrated)
+    pool = loaded.draft.pool
+    assert [(pool.name(row), pool.position(row), pool.overall[row]) for row in loaded.draft.board.ranked()] == expected
+
+
+def test_journal_replay_matches_live_game(tmp_path):
+    game = new_game(tmp_path, autosave=True)
+    game.run_draft_phase()
+    game.advance_weeks(6) # Past a compaction, with weeks left in the journal
+
+    loaded = Game.load_autosave(str(tmp_path))
+    assert (loaded.current_state, loaded.current_week) == (game.current_state, game.current_week)
+    assert roster_rows(loaded) == roster_rows(game)
+    assert schedule_rows(loaded) == schedule_rows(game)
+    assert loaded.standings.to_rows() == game.standings.to_rows()
+
+
+def test_journal_replays_offseason_signings(tmp_path):
+    game = new_game(tmp_path, autosave=True)
+    for _ in range(2): # The first draft takes the whole class; the second leaves free agents
+        game.run_draft_phase()
+        game.advance_weeks(Game.SEASON_WEEKS)
+        game.next_season()
+    journal = list(game.journal.read_records())
+    assert any(record["type"] == "roster_move" and record["from"] == save_format.NO_TEAM for record in journal)
+
+    loaded = Game.load_autosave(str(tmp_path))
+    assert loaded.current_state == "DRAFT"
+    assert roster_rows(loaded) == roster_rows(game)
+
+
+def test_journal_keeps_completed_draft_rounds(tmp_path, monkeypatch):
+    import draft_ai
+
+    game = new_game(tmp_path, autosave=True)
+    choose_pick = draft_ai.NeedBasedStrategy.choose_pick
+
+    def crash_in_round_six(strategy, draft, team):
+        if draft.current_pick == 5 * len(draft.teams) + 2:
+            raise KeyboardInterrupt # The game dies partway through a round
+        return choose_pick(strategy, draft, team)
+
+    monkeypatch.setattr(draft_ai.NeedBasedStrategy, "choose_pick", crash_in_round_six)
+    try:
+        game.run_draft_phase()
+    except KeyboardInterrupt:
+        pass
+    monkeypatch.undo()
+
+    loaded = Game.load_autosave(str(tmp_path))
+    assert loaded.current_state == "DRAFT"
+    assert loaded.draft.current_pick == 5 * len(loaded.all_teams)
+    assert [len(team.roster) for team in loaded.all_teams] == [5] * len(loaded.all_teams)
+
+    loaded.verbose = False
+    loaded.run_draft_phase() # Picks up with the round that was lost
+    assert sum(len(team.roster) for team in loaded.all_teams) == len(loaded.draft.pool)